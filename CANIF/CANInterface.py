@@ -12,6 +12,7 @@ from CANIF.RWThread.CANReaderThread import *
 from CANIF.RWThread.CANWriterScheduler import*
 from CANIF.RWThread.FileWriterThread import FileWriterThread
 from E2E.DbcAdapter import DBCAdapter
+from functools import partial
 from typing import Union, Any, Optional, Callable
 import ctypes
 import atexit
@@ -57,6 +58,7 @@ class CANInterface:
         self.messages_periodic = {}
         self.is_fd = is_fd
         self.padding = padding
+        self._pad_bytes: dict[str, int] = {}
         self.reader = None
         self.scheduler = None
         self.dbc = DBCAdapter(dbc_path) if dbc_path else None
@@ -233,11 +235,18 @@ class CANInterface:
             logger.error(f"Error reading CAN message: {e}")
             return None
  
+    def _pad_byte(self, padding: str) -> int:
+        """Parse a hex padding string once and reuse the int afterwards."""
+        pad_byte = self._pad_bytes.get(padding)
+        if pad_byte is None:
+            pad_byte = self._pad_bytes[padding] = int(padding, 16)
+        return pad_byte
+ 
     def write(self, message_id, raw_data,padding = None, is_fd = None):
         """
         Write function: Send message on CAN-CANFD bus  
         param:  raw_data = '22 F1 00'
-                message_id : str
+                message_id : str (hex) or int
                 is_fd : bool
                 lenght : len of message
         """
@@ -247,17 +256,17 @@ class CANInterface:
             logger.error("Error: CAN bus is not initialized.")
             return False
         try:
-            can_id = int(message_id,16)
+            can_id = message_id if isinstance(message_id, int) else int(message_id,16)
             data = Str2HexArr(raw_data) # Convert '22 F100' --> [0x22, 0xF1, 0x00] (hex)
             if not padding:
                 padding = self.padding
             if self.is_fd:
-                data = add_padding(data,padding=padding)
+                data = add_padding(data,padding=self._pad_byte(padding))
  
             msg = can.Message(arbitration_id=can_id, data=data, is_extended_id=False, is_fd=self.is_fd)
             self.bus.send(msg)
             self._notify_tx(msg)
-            logger.info(f"->{message_id}: {raw_data}")
+            logger.info(f"->{can_id:X}: {raw_data}")
             return True
         except can.CanError as e:
             logger.error(f"Error sending CAN <{message_id}>: {raw_data}")
@@ -401,8 +410,12 @@ class CANInterface:
    
     def _start_periodic_by_message_id(self, msg_id, period:int = None, duration = None, is_fd = None, is_extended_id = False):
  
-        def _get_payload():
-            return self.dbc.get_payload(msg_id)
+        slot = self.dbc.idx_by_id.get(msg_id)
+        if slot is not None:
+            _get_payload = partial(self.dbc.get_payload_by_idx, slot)
+        else:
+            def _get_payload():
+                return self.dbc.get_payload(msg_id)
        
         self.scheduler.add_message(
             msg_id = msg_id,
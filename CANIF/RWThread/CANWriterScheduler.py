@@ -154,6 +154,9 @@ class SmartCanMessageScheduler:
         if task:
             task.stop()
  
+    def is_running(self, msg_id: int) -> bool:
+        return msg_id in self.tasks
+ 
     def trigger_burst(self, msg_id: int, count: int = 3, spacing: float = 0.04):
         with self.lock:
             task = self.tasks.get(msg_id)
@@ -72,36 +72,58 @@ def increaseSN(SN):
     else:
         return 0
  
+def encodeSF(data:list, chunk_length=8):
+    """
+    Encode data (len <= 7) into a zero padded SF
+    """
+    data_len = len(data)
+    retSF = [data_len]
+    retSF.extend(data)
+    retSF.extend([0]*(0x7-data_len))
+    return HexArr2Str(retSF),[]
+ 
+def encodeFF(data:list, chunk_length=8):
+    """
+    Encode FF when 7 < len <= 4095 (12 bit FF_DL)
+    """
+    data_len = len(data)
+    extend_data = [0x10 | ((data_len >> 8) & 0xF), 0xFF & data_len]
+    extend_data.extend(data)
+    retFF, remain_data = slice1stChunk(extend_data,chunk_length)
+    return HexArr2Str(retFF),remain_data
+ 
+def encodeFFEscape(data:list, chunk_length=8):
+    """
+    Encode FF when len < 4,294,967,295 (escape sequence, 32 bit FF_DL)
+    """
+    data_len = len(data)
+    extend_data = [0x10, 0x00,
+                   0xFF & (data_len >> 24),
+                   0xFF & (data_len >> 16),
+                   0xFF & (data_len >> 8),
+                   0xFF & data_len]
+    extend_data.extend(data)
+    retFF, remain_data = slice1stChunk(extend_data,chunk_length)
+    return HexArr2Str(retFF),remain_data
+ 
+FF_ENCODERS = (encodeSF, encodeFF, encodeFFEscape)
+"""Encoders indexed by lengthClass()"""
+ 
+def lengthClass(data_len):
+    """
+    Return the FF_ENCODERS index matching the payload length
+    0: SF, 1: FF (12 bit length), 2: FF (escape sequence)
+    """
+    return (data_len > 0x7) + (data_len > 0xFFF)
+ 
 def convertFF(data:list, chunk_length=8):
     """
     Convert data into FF base on data's length
     """
     data_len = len(data)
-    retFF = []
-    remain_data = []
-    extend_data = []
-   
-    if data_len <= 0x7:                                     # FF is SF
-        retFF.extend([data_len])
-        retFF.extend(data)
-        retFF.extend([0]*(0x7-data_len))
-    elif data_len <= 0xFFF:                                 # FF when 7 < len < 4095
-        Byte_0 = 0x10 | ((data_len >> 8) & 0xF)
-        Byte_1 = 0xFF & data_len
-        extend_data = [Byte_0,Byte_1]
-        extend_data.extend(data)
-        retFF, remain_data = slice1stChunk(extend_data,chunk_length)
-    elif data_len <= 0xFFFFFFFF:                            # FF when len < 4,294,967,295
-        Byte_0 = 0x10
-        Byte_1 = 0x00
-        Byte_2 = 0xFF & (data_len >> 24)
-        Byte_3 = 0xFF & (data_len >> 16)
-        Byte_4 = 0xFF & (data_len >> 8)
-        Byte_5 = 0xFF & data_len
-        extend_data = [Byte_0,Byte_1,Byte_2,Byte_3,Byte_4,Byte_5]
-        extend_data.extend(data)
-        retFF, remain_data = slice1stChunk(extend_data,chunk_length)
-    return HexArr2Str(retFF),remain_data
+    if data_len > 0xFFFFFFFF:
+        return HexArr2Str([]),[]
+    return FF_ENCODERS[lengthClass(data_len)](data, chunk_length)
  
 def nextCF(SN,data,chunk_length=8):
     """
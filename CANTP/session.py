@@ -2,18 +2,27 @@
 from __future__ import annotations
 
 import logging
+import queue
 import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from functools import partial
+from typing import Callable, List, Optional, Tuple
 
 from CANIF.CANInterface import CANInterface
 from COMMON.Cast import Hex, HexArr2StrArr, Str2HexArr
 from CANTP.Description import FCFS_CTS, FCFS_WAIT, FCFS_OVFLW
-from CANTP.Frame import convertFF, expectedFrames, extractCF, increaseSN, nextCF
+from CANTP.Frame import FF_ENCODERS, increaseSN, lengthClass, nextCF
 
 logger = logging.getLogger(__name__)
 
+# STmin byte -> separation time in seconds (ISO 15765-2): 0x00-0x7F are
+# milliseconds, 0xF1-0xF9 are 100-900 microseconds, everything else reserved.
+_STMIN_SECONDS = tuple(
+    value / 1000.0 if value <= 0x7F else (value - 0xF0) / 10000.0 if 0xF1 <= value <= 0xF9 else 0.0
+    for value in range(256)
+)
+
 
 @dataclass
 class FlowControlSettings:
@@ -34,14 +43,14 @@ class FlowControlSettings:
 class FlowController:
     """Utility that transmits flow control frames."""
 
-    def __init__(self, canif: CANInterface, ecu_id: str, padding: str) -> None:
+    def __init__(self, canif: CANInterface, ecu_id: int, padding: str) -> None:
         self._canif = canif
         self._ecu_id = ecu_id
         self._padding = padding
 
     def send(self, settings: FlowControlSettings) -> bool:
         payload = settings.build_payload()
-        logger.debug("Sending FlowControl -> %s: %s", self._ecu_id, payload)
+        logger.debug("Sending FlowControl -> %X: %s", self._ecu_id, payload)
         return self._canif.write(self._ecu_id, payload, padding=self._padding)
 
 
@@ -62,39 +71,57 @@ class CANTPSession:
         self._canif = canif
         self._ecu_id = ecu_id.upper()
         self._tester_id = tester_id.upper()
-        self._tester_id_key = int(self._tester_id, 16)
+        # Integer forms are what the reader/writer key on; parse them once.
+        self._ecu_id_int = int(self._ecu_id, 16)
+        self._tester_id_int = int(self._tester_id, 16)
         self._chunk_length = chunk_length
         self._padding = padding
         self._rx_flow_control = rx_flow_control
         self._flow_control_timeout_ms = flow_control_timeout_ms
-        self._rx_buffer: List[List[str]] = []
-        self._buffer_cond = threading.Condition()
+        # The reader thread is the only producer and receive()/send() the only
+        # consumers, so frames are handed over through lock-free SimpleQueues
+        # split by PCI class: SF/FF, CF and FC.
+        self._start_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._cf_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._fc_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._rx_queues = {
+            0x0: self._start_queue,
+            0x1: self._start_queue,
+            0x2: self._cf_queue,
+            0x3: self._fc_queue,
+        }
         self._closed = False
         self._rx_lock = threading.Lock()
         self._tx_lock = threading.Lock()
-        self._flow_controller = FlowController(canif, self._ecu_id, padding)
-        self._register_callback()
+        self._flow_controller = FlowController(canif, self._ecu_id_int, padding)
+        # SF / FF / FF-escape encoders pre-bound to this session's chunk length.
+        self._ff_encoders = tuple(partial(encoder, chunk_length=chunk_length) for encoder in FF_ENCODERS)
 
     # ------------------------------------------------------------------
     # Life-cycle helpers
     # ------------------------------------------------------------------
+    def open(self) -> None:
+        """Start receiving frames for this session's tester ID."""
+        self._register_callback()
+
     def _register_callback(self) -> None:
+        rx_queues = self._rx_queues
+
         def _on_frame(message) -> None:
-            # Frames are pulled from the reader's per-ID queue; we only use the
-            # callback to wake up waiters when new data arrives.
-            if self._closed:
+            # Runs on the reader thread: classify once and hand the raw bytes
+            # to the matching queue. Unknown PCI types are dropped here.
+            if self._closed or not message.data:
                 return
-            with self._buffer_cond:
-                self._buffer_cond.notify_all()
+            target = rx_queues.get(message.data[0] >> 4)
+            if target is not None:
+                target.put_nowait(bytes(message.data))
 
-        self._canif.subscribe_id_queue(self._tester_id, callback=_on_frame, queue_name="cantp")
+        self._canif.subscribe_id_queue(self._tester_id_int, callback=_on_frame)
 
     def close(self) -> None:
-        with self._buffer_cond:
-            self._closed = True
-            self._buffer_cond.notify_all()
+        self._closed = True
         try:
-            self._canif.unsubscribe_id_queue(self._tester_id, queue_name="cantp")
+            self._canif.unsubscribe_id_queue(self._tester_id_int)
         except Exception:
             logger.exception("Failed to unsubscribe CAN ID %s", self._tester_id)
 
@@ -108,185 +135,186 @@ class CANTPSession:
         """Receive a single PDU (list of hex strings) from the ECU."""
         with self._rx_lock:
             self._reset_receive_state()
-            first_frame = self._pop_matching(self._is_transport_payload, timeout_ms)
+            first_frame = self._pop_queue(self._start_queue, timeout_ms)
             if not first_frame:
                 logger.debug("Timeout waiting for first frame on %s", self._tester_id)
                 return []
 
             pci_type = self._pci_type(first_frame)
             if pci_type == 0x0:  # Single Frame
-                payload_length = int(first_frame[0], 16) & 0x0F
-                return first_frame[1 : 1 + payload_length]
+                payload_length = first_frame[0] & 0x0F
+                return HexArr2StrArr(first_frame[1 : 1 + payload_length])
 
             if pci_type != 0x1:
                 logger.warning("Unexpected PCI type %s while waiting for FF", pci_type)
                 return []
 
-            expected_frames, total_length, data = expectedFrames(first_frame, self._chunk_length)
+            total_length, header_length = self._first_frame_length(first_frame)
+            # CF payloads are collected as bytes slices and joined once at the
+            # end; conversion to hex strings happens only for the final PDU.
+            chunks = [first_frame[header_length:]]
+            received = len(chunks[0])
             logger.debug(
-                "First frame received -> expected=%s total_length=%s current=%s",
-                expected_frames,
+                "First frame received -> total_length=%s current=%s",
                 total_length,
-                len(data),
+                received,
             )
             if not self._flow_controller.send(self._rx_flow_control):
                 logger.error("Failed to transmit Flow Control frame to %s", self._ecu_id)
                 return []
-            remaining_ms = timeout_ms
+            # Until the PDU is complete only CFs are consumed; any SF/FF/FC that
+            # arrives meanwhile is already parked in its own queue.
+            next_cf = self._cf_queue.get
+            timeout_s = timeout_ms / 1000.0
             last_activity = time.monotonic()
             expected_sn = 1
 
-            while len(data) < total_length:
-                remaining_ms = self._remaining_ms(last_activity, timeout_ms)
-                if remaining_ms <= 0:
+            while received < total_length:
+                remaining_s = timeout_s - (time.monotonic() - last_activity)
+                if remaining_s <= 0:
                     logger.warning("Timeout while waiting for CF frames from %s", self._tester_id)
                     return []
 
-                cf = self._pop_matching(self._is_consecutive_frame, remaining_ms)
-                if not cf:
+                try:
+                    batch = [next_cf(timeout=remaining_s)]
+                except queue.Empty:
                     logger.warning("Timeout retrieving consecutive frame from %s", self._tester_id)
                     return []
 
                 last_activity = time.monotonic()
-
-                seq_num = int(cf[0], 16) & 0x0F
-                if seq_num != expected_sn:
-                    logger.warning(
-                        "Out-of-order CF (expected %s got %s) from %s", expected_sn, seq_num, self._tester_id
-                    )
-                    continue
-
-                expected_sn = increaseSN(expected_sn)
-                data.extend(cf[1:])
-
-            return data[:total_length]
+                # Take everything that piled up behind the first CF so a burst
+                # is processed in one pass before blocking again.
+                batch.extend(self._drain_queue(self._cf_queue))
+
+                for cf in batch:
+                    seq_num = cf[0] & 0x0F
+                    if seq_num != expected_sn:
+                        logger.warning(
+                            "Out-of-order CF (expected %s got %s) from %s", expected_sn, seq_num, self._tester_id
+                        )
+                        continue
+
+                    expected_sn = increaseSN(expected_sn)
+                    chunks.append(cf[1:])
+                    received += len(cf) - 1
+                    if received >= total_length:
+                        break
+
+            return HexArr2StrArr(b"".join(chunks)[:total_length])
 
     def send(self, data: str, padding: Optional[str] = None) -> bool:
         padding = padding if padding is not None else self._padding
         with self._tx_lock:
             raw_data = Str2HexArr(data)
-            frame, remain_data = convertFF(raw_data, self._chunk_length)
+            frame, remain_data = self._select_encoder(len(raw_data))(raw_data)
 
             if not remain_data:  # Single Frame
-                return self._canif.write(self._ecu_id, frame, padding=padding)
+                return self._canif.write(self._ecu_id_int, frame, padding=padding)
 
-            if not self._canif.write(self._ecu_id, frame, padding=padding):
+            if not self._canif.write(self._ecu_id_int, frame, padding=padding):
                 return False
 
-            fc_settings = self._wait_for_flow_control()
-            if not fc_settings:
+            fc_info = self._wait_for_flow_control()
+            if not fc_info:
                 logger.warning("Did not receive Flow Control frame from %s", self._tester_id)
                 return False
 
-            block_size = fc_settings.block_size
-            st_min_seconds = self._interpret_st_min(fc_settings.st_min)
-            frames_in_block = 0
+            _, block_size, fcstmin = fc_info
+            st_min_seconds = self._interpret_st_min(fcstmin)
+            # CFs sent since the last FC; only block on the receiver once the
+            # advertised window (BS) is used up. BS == 0 means no further FC.
+            outstanding = 0
             sequence_number = 0
 
             while remain_data:
                 sequence_number = increaseSN(sequence_number)
                 frame, remain_data = nextCF(sequence_number, remain_data, self._chunk_length)
-                if not self._canif.write(self._ecu_id, frame, padding=padding):
+                if not self._canif.write(self._ecu_id_int, frame, padding=padding):
                     return False
-
-                frames_in_block += 1
-                if st_min_seconds:
-                    time.sleep(st_min_seconds)
-
-                if block_size and frames_in_block >= block_size and remain_data:
-                    fc_settings = self._wait_for_flow_control()
-                    if not fc_settings:
+                if not remain_data:
+                    break
+
+                outstanding += 1
+                if block_size and outstanding >= block_size:
+                    # The FC round-trip already spaces the next CF, skip STmin.
+                    fc_info = self._wait_for_flow_control()
+                    if not fc_info:
                         logger.warning("Flow Control timeout in block for %s", self._tester_id)
                         return False
-                    if fc_settings.flow_status != FCFS_CTS:
-                        logger.warning("Unexpected Flow Status %s", fc_settings.flow_status)
+                    fcfs, block_size, fcstmin = fc_info
+                    if fcfs != FCFS_CTS:
+                        logger.warning("Unexpected Flow Status %s", fcfs)
                         return False
-                    block_size = fc_settings.block_size
-                    st_min_seconds = self._interpret_st_min(fc_settings.st_min)
-                    frames_in_block = 0
+                    st_min_seconds = self._interpret_st_min(fcstmin)
+                    outstanding = 0
+                elif st_min_seconds:
+                    time.sleep(st_min_seconds)
 
             return True
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _wait_for_flow_control(self) -> Optional[FlowControlSettings]:
+    def _select_encoder(self, data_len: int) -> Callable[[List[int]], Tuple[str, List[int]]]:
+        return self._ff_encoders[lengthClass(data_len)]
+
+    def _wait_for_flow_control(self) -> Optional[Tuple[int, int, int]]:
+        """Wait for a CTS Flow Control frame and return ``(FS, BS, STmin)``."""
         deadline_ms = self._flow_control_timeout_ms
         start = time.monotonic()
         while True:
             remaining_ms = self._remaining_ms(start, deadline_ms)
             if remaining_ms <= 0:
                 return None
-            fc_payload = self._pop_matching(self._is_flow_control_frame, remaining_ms)
+            fc_payload = self._pop_queue(self._fc_queue, remaining_ms)
             if not fc_payload:
                 return None
-            fcfs, fcbs, fcstmin = extractCF(fc_payload)
+            fcfs, fcbs, fcstmin = fc_payload[0] & 0x3, fc_payload[1], fc_payload[2]
             if fcfs == FCFS_WAIT:
                 logger.debug("Received WAIT flow control -> waiting for next")
                 continue
             if fcfs == FCFS_OVFLW:
                 logger.error("Flow control overflow received from %s", self._tester_id)
                 return None
-            return FlowControlSettings(block_size=fcbs, st_min=fcstmin, flow_status=fcfs)
-
-    def _pop_matching(self, predicate: Callable[[List[str]], bool], timeout_ms: int) -> Optional[List[str]]:
-        deadline = time.monotonic() + (timeout_ms / 1000.0)
-        with self._buffer_cond:
-            while True:
-                self._drain_rx_queue()
-                for index, payload in enumerate(self._rx_buffer):
-                    if predicate(payload):
-                        return self._rx_buffer.pop(index)
-                remaining = deadline - time.monotonic()
-                if remaining <= 0:
-                    return None
-                self._buffer_cond.wait(timeout=remaining)
+            return fcfs, fcbs, fcstmin
 
-    def _reset_receive_state(self) -> None:
-        """Clear stale buffered data before starting a new reception."""
-        with self._buffer_cond:
-            self._rx_buffer.clear()
+    @staticmethod
+    def _pop_queue(source: queue.SimpleQueue, timeout_ms: int) -> Optional[bytes]:
+        if timeout_ms <= 0:
+            return None
         try:
-            self._canif.reset_id_queue(self._tester_id, queue_name="cantp")
-        except Exception:
-            logger.exception("Failed to reset queue for tester %s", self._tester_id)
-
-    def _drain_rx_queue(self) -> None:
-        """Move any queued frames for this tester ID into the session buffer."""
-
-        while True:
-            msg = self._canif.reader.get_from_id(self._tester_id_key, pop=True, queue_name="cantp")
-            if msg is None:
-                return
-            payload = HexArr2StrArr(msg.data)
-            self._rx_buffer.append(payload)
+            return source.get(timeout=timeout_ms / 1000.0)
+        except queue.Empty:
+            return None
 
     @staticmethod
-    def _is_transport_payload(frame: List[str]) -> bool:
-        """Return True only for SF/FF frames used to start a reception."""
-        if not frame:
-            return False
-        pci = int(frame[0], 16) >> 4
-        # Guard against stray Consecutive Frames that may linger in the
-        # receive queue from a prior session. Starting a new reception with a
-        # CF would immediately fail, so ignore them here.
-        return pci in (0x0, 0x1)
+    def _drain_queue(source: queue.SimpleQueue) -> List[bytes]:
+        """Return every frame currently buffered in ``source`` without blocking."""
+        frames = []
+        try:
+            while True:
+                frames.append(source.get_nowait())
+        except queue.Empty:
+            return frames
 
-    @staticmethod
-    def _is_consecutive_frame(frame: List[str]) -> bool:
-        if not frame:
-            return False
-        return (int(frame[0], 16) >> 4) == 0x2
+    def _reset_receive_state(self) -> None:
+        """Clear stale buffered data before starting a new reception."""
+        # Stray CFs/FCs from a prior exchange must not leak into this one.
+        for source in (self._start_queue, self._cf_queue, self._fc_queue):
+            self._drain_queue(source)
 
     @staticmethod
-    def _is_flow_control_frame(frame: List[str]) -> bool:
-        if not frame:
-            return False
-        return (int(frame[0], 16) >> 4) == 0x3
+    def _pci_type(frame: bytes) -> int:
+        return frame[0] >> 4
 
     @staticmethod
-    def _pci_type(frame: List[str]) -> int:
-        return int(frame[0], 16) >> 4
+    def _first_frame_length(frame: bytes) -> Tuple[int, int]:
+        """Return ``(FF_DL, header length)`` for a First Frame."""
+        ff_dl = ((frame[0] & 0x0F) << 8) | frame[1]
+        if ff_dl:
+            return ff_dl, 2
+        # FF_DL escape: 12-bit length is zero, 32-bit length follows.
+        return int.from_bytes(frame[2:6], "big"), 6
 
     @staticmethod
     def _remaining_ms(start: float, timeout_ms: int) -> int:
@@ -295,11 +323,7 @@ class CANTPSession:
 
     @staticmethod
     def _interpret_st_min(value: int) -> float:
-        if value <= 0x7F:
-            return value / 1000.0
-        if 0xF1 <= value <= 0xF9:
-            return (value - 0xF0) / 10000.0
-        return 0.0
+        return _STMIN_SECONDS[value & 0xFF]
 
 
 class CANTPSessionManager:
@@ -320,24 +344,35 @@ class CANTPSessionManager:
         self._default_rx_flow_control = default_rx_flow_control
         self._flow_control_timeout_ms = flow_control_timeout_ms
         self._sessions: dict[tuple[str, str], CANTPSession] = {}
+        # Sessions keyed by the IDs exactly as callers pass them, so repeated
+        # lookups skip the upper-casing and the lock.
+        self._session_cache: dict[tuple[str, str], CANTPSession] = {}
         self._lock = threading.Lock()
 
     def get_session(self, ecu_id: str, tester_id: str) -> CANTPSession:
-        key = (ecu_id.upper(), tester_id.upper())
-        with self._lock:
-            session = self._sessions.get(key)
-            if session is None:
-                session = CANTPSession(
-                    self._canif,
-                    ecu_id,
-                    tester_id,
-                    chunk_length=self._chunk_length,
-                    padding=self._padding,
-                    rx_flow_control=self._clone_flow_control(),
-                    flow_control_timeout_ms=self._flow_control_timeout_ms,
-                )
-                self._sessions[key] = session
+        session = self._session_cache.get((ecu_id, tester_id))
+        if session is not None:
             return session
+        key = (ecu_id.upper(), tester_id.upper())
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = CANTPSession(
+                        self._canif,
+                        *key,
+                        chunk_length=self._chunk_length,
+                        padding=self._padding,
+                        rx_flow_control=self._clone_flow_control(),
+                        flow_control_timeout_ms=self._flow_control_timeout_ms,
+                    )
+                    # Subscribe before publishing: no caller may send on a
+                    # session whose Flow Control/response frames would be lost.
+                    session.open()
+                    self._sessions[key] = session
+        self._session_cache[(ecu_id, tester_id)] = session
+        return session
 
     def configure_rx_flow_control(
         self, ecu_id: str, tester_id: str, settings: FlowControlSettings
@@ -350,6 +385,7 @@ class CANTPSessionManager:
             for session in self._sessions.values():
                 session.close()
             self._sessions.clear()
+            self._session_cache.clear()
 
     def _clone_flow_control(self) -> FlowControlSettings:
         cfg = self._default_rx_flow_control
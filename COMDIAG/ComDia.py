@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import queue
 import threading
-import time
+from functools import lru_cache
 from typing import Optional
 
 from CANTP.CANTP import CANTP
 from CANTP.Frame import NRC_check
 from CANTP.session import FlowControlSettings
 from CANIF.CANInterface import CANInterface
-from COMMON.Cast import Hex, StrArr2Int
+from COMMON.Cast import Hex, StrArr2Int, hex2int
 from proxy_dll.Generate_key_from_dll import ASK_KeyGenerate
 from logger.log import logger
 
+# Caller-supplied ECU IDs repeat, so normalise each distinct one only once.
+_upper_id = lru_cache(maxsize=64)(str.upper)
+
+_TESTER_PRESENT = "3E 80"
+# Queued in place of a request to make the TX worker exit.
+_TX_STOP = None
+
 
 class ComDiag:
     """High level diagnostic utilities backed by :class:`CANTP`."""
@@ -43,7 +51,16 @@ class ComDiag:
         self.tester_id = tester_id.upper()
         self.ecu_id = ecu_id.upper()
         self.keep_alive = False
+        self._stop_event = threading.Event()
         self.thread: Optional[threading.Thread] = None
+        # Fire-and-forget requests (Tester Present) are handed to one TX worker
+        # that sends whatever is queued back-to-back per wake-up.
+        self._tx_queue: queue.SimpleQueue = queue.SimpleQueue()
+        # (ecu_id, msg) requests queued but not yet picked up; a duplicate is
+        # dropped instead of queued, so at most one of each can be pending.
+        self._tx_pending: set[tuple[str, str]] = set()
+        self._tx_thread: Optional[threading.Thread] = None
+        self._tx_lock = threading.Lock()
         self.dll = dll
 
     # ------------------------------------------------------------------
@@ -62,18 +79,18 @@ class ComDiag:
     # ------------------------------------------------------------------
     def send(self, msg: str, lenght: int = 8, ecu_id: Optional[str] = None) -> bool:
         del lenght  # kept for backwards compatibility with previous signature
-        if not ecu_id:
-            ecu_id = self.ecu_id
-        return self.cantp.send(ecu_id.upper(), self.tester_id, msg)
+        ecu_id = _upper_id(ecu_id) if ecu_id else self.ecu_id
+        return self.cantp.send(ecu_id, self.tester_id, msg)
 
     def receive(self, timeout: int = 300) -> list[str]:
         """Receive a diagnostic response payload (without PCI metadata)."""
 
-        recv = self.cantp.receive(self.ecu_id, self.tester_id, timeout)
-        if recv and NRC_check(recv) and len(recv) > 2:
-            if int(recv[2], 16) == 0x78:
-                return self.receive(timeout=timeout)
-        return recv
+        while True:
+            recv = self.cantp.receive(self.ecu_id, self.tester_id, timeout)
+            # NRC 0x78 (response pending): keep waiting for the real answer.
+            if recv and NRC_check(recv) and len(recv) > 2 and hex2int(recv[2]) == 0x78:
+                continue
+            return recv
 
     def send_and_received(
         self,
@@ -88,42 +105,115 @@ class ComDiag:
         msg = raw_msg.replace(" ", "")
         SID = msg[:2]
         send = self.send(raw_msg, lenght=lenght, ecu_id=ecu_id)
-        start_time = time.time()
 
         if not send:
             return None
+        # CAN-TP receive blocks on its RX queue for the whole timeout and only
+        # returns empty once it has expired, so one call is enough.
         recv = self.receive(timeout=timeout)
-        while (not recv) and (time.time() - start_time < (timeout / 1000)):
-            recv = self.receive(timeout=timeout)
 
         if not recv:
             return None
-        pos_sid = Hex(int(recv[0], 16) - 0x40)
+        pos_sid = Hex(hex2int(recv[0]) - 0x40)
         if recv[0] == SID or pos_sid == SID:
             return recv
         if len(recv) > 1:
-            pos_sid = Hex(int(recv[1], 16) - 0x40)
+            pos_sid = Hex(hex2int(recv[1]) - 0x40)
             if recv[1] == SID or pos_sid == SID:
                 return recv
         return None
 
+    def send_async(self, msg: str, ecu_id: Optional[str] = None) -> None:
+        """Queue a request for the background TX worker without waiting for it."""
+
+        request = (ecu_id or self.ecu_id, msg)
+        with self._tx_lock:
+            if request in self._tx_pending:
+                return
+            self._tx_pending.add(request)
+            self._tx_queue.put(request)
+            if not (self._tx_thread and self._tx_thread.is_alive()):
+                self._tx_thread = threading.Thread(target=self._tx_loop, daemon=True)
+                self._tx_thread.start()
+
+    def _discard_queued(self, msg: str) -> None:
+        """Drop every queued, not yet sent request carrying ``msg``."""
+
+        with self._tx_lock:
+            keep = []
+            try:
+                while True:
+                    request = self._tx_queue.get_nowait()
+                    if request is not _TX_STOP and request[1] == msg:
+                        self._tx_pending.discard(request)
+                    else:
+                        keep.append(request)
+            except queue.Empty:
+                pass
+            for request in keep:
+                self._tx_queue.put(request)
+
+    def _stop_tx_worker(self) -> None:
+        with self._tx_lock:
+            thread = self._tx_thread
+            self._tx_thread = None
+            if thread is None or not thread.is_alive():
+                return
+            self._tx_queue.put(_TX_STOP)
+        thread.join()
+        # Requests queued behind the stop marker are dropped with the worker.
+        with self._tx_lock:
+            try:
+                while True:
+                    self._tx_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._tx_pending.clear()
+
+    def _tx_loop(self) -> None:
+        """Drain the TX queue, sending every pending request per wake-up."""
+
+        tx_queue = self._tx_queue
+        pending = self._tx_pending
+        tx_lock = self._tx_lock
+        send = self.send
+        while True:
+            batch = [tx_queue.get()]
+            try:
+                while True:
+                    batch.append(tx_queue.get_nowait())
+            except queue.Empty:
+                pass
+            with tx_lock:
+                for request in batch:
+                    if request is not _TX_STOP:
+                        pending.discard(request)
+            for request in batch:
+                if request is _TX_STOP:
+                    return
+                ecu_id, msg = request
+                if not send(msg, ecu_id=ecu_id):
+                    logger.warning(f"Warning: queued request '{msg}' to {ecu_id} failed!")
+
     def send_tester_present(self, ecu_id: Optional[str]) -> bool:
         """Send a Tester Present (0x3E 80) message to keep the session alive."""
 
         if not ecu_id:
             ecu_id = self.ecu_id
-        tester_present_msg = "3E 80"
-        return self.send(tester_present_msg, ecu_id=ecu_id)
+        return self.send(_TESTER_PRESENT, ecu_id=ecu_id)
 
     def _tester_present_loop(self, interval: int, ecu_id: str) -> None:
         """Internal method to send Tester Present messages in a loop."""
 
         interval_sec = interval / 1000
+        send_async = self.send_async
+        wait = self._stop_event.wait
         while self.keep_alive:
-            success = self.send_tester_present(ecu_id)
-            if not success:
-                logger.warning("Warning: Tester Present message failed!")
-            time.sleep(interval_sec)
+            # Queued rather than sent inline so a long transfer holding the
+            # CAN-TP TX lock does not stretch the Tester Present cadence.
+            send_async(_TESTER_PRESENT, ecu_id=ecu_id)
+            if wait(interval_sec):
+                break
         logger.info("Stopped Tester Present")
 
     def start_tester_present(self, interval: int = 2000, ecu_id: Optional[str] = None) -> None:
@@ -136,6 +226,7 @@ class ComDiag:
             return
 
         self.keep_alive = True
+        self._stop_event.clear()
         self.thread = threading.Thread(
             target=self._tester_present_loop,
             args=(interval, ecu_id),
@@ -152,8 +243,12 @@ class ComDiag:
 
         logger.info("Stopping Tester Present loop...")
         self.keep_alive = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join()
+        # A Tester Present still queued behind a long transfer must not go
+        # out once the loop is stopped.
+        self._discard_queued(_TESTER_PRESENT)
 
     def get_key(self, req: list[str]) -> Optional[str]:
         if not self.dll:
@@ -202,4 +297,5 @@ class ComDiag:
         """Tear down CAN-TP resources tracked by this diagnostic helper."""
 
         self.stop_tester_present()
+        self._stop_tx_worker()
         self.cantp.shutdown()
@@ -5,6 +5,8 @@ Last update: 22-Jan-2025
     - First Initial
 '''
  
+from bisect import bisect_left
+ 
 # '''
 # <-7BB: 10 4F 59 02 09 92 81 11
 # ->7B3: 30 00 14 00 00 00 00 00
@@ -24,16 +26,32 @@ Last update: 22-Jan-2025
 # <-7BB: 10 0D 62 F1 87 39 37 32
 # <-7BB: 21 35 35 44 43 30 31 30'''
  
+# Two-digit upper-case hex string -> int, e.g. 'F1' -> 0xF1
+HEX256 = {f'{i:02X}': i for i in range(256)}
+ 
+def hex2int(input_str:str):
+    '''
+    Convert one hex byte string into int, using HEX256 for the common case
+    Eg: (str)'7F' --> 0x7F
+    '''
+    try:
+        return HEX256[input_str]
+    except KeyError:
+        return int(input_str,16)
+ 
 def Hex(input_value:int):
     '''
     Convert interger into hex string
     Eg:  (int)0x0F0F -> '0F 0F'(str)
     '''
-    temp = hex(input_value)[2:]
+    temp = format(input_value, 'X')
     if len(temp) % 2 != 0:
         temp = '0' + temp
-    output = ' '.join(Split_by_num(temp,2))
-    return output.upper()
+    try:
+        return bytes.fromhex(temp).hex(' ').upper()
+    except ValueError:
+        # Negative values have no byte representation
+        return temp
  
 def Split_by_num(input_str:str, num:int):
     '''
@@ -47,26 +65,15 @@ def HexArr2Str(msg:list):
     Convert array of bytes in message into string
     Eg: 0xF100(in hex) --> 'F1 00'(in string)
     '''
-    ret = ''
-    for val in msg:
-        temp = str(hex(val))[2:]
-        if len(temp)<2:
-            temp = '0' + temp
-        ret = ret + temp + ' '
-    return ret.upper()
+    ret = bytes(msg).hex(' ').upper()
+    return ret + ' ' if ret else ret
  
 def HexArr2StrArr(msg:list):
     '''
     Convert array of bytes in message into string
     Eg: 0xF100(in hex) --> ['F1','00']
     '''
-    ret = []
-    for val in msg:
-        temp = str(hex(val))[2:]
-        if len(temp)<2:
-            temp = '0' + temp
-        ret.append(temp.upper())
-    return ret
+    return bytes(msg).hex(' ').upper().split()
  
  
 def Str2HexArr(input_str):
@@ -74,16 +81,10 @@ def Str2HexArr(input_str):
     Convert string of hex into list of int(hex)
     Eg: (str)'22 F100' --> [0x22, 0xF1, 0x00] (hex)
     '''
-    input_str = input_str.replace(' ','').upper()
-    while len(input_str) % 2 != 0:
+    input_str = input_str.replace(' ','')
+    if len(input_str) % 2 != 0:
         input_str = input_str + '0'
-    # data_len = hex(int(len(input_str)/2))[2:]
- 
-    # if len(data_len) < 2:
-    #     data_len = '0' + data_len
-    # input_str = data_len + input_str
- 
-    return [int(input_str[i:i+2],16) for i in range(0, len(input_str),2)]
+    return list(bytes.fromhex(input_str))
  
 def Str2StrArr(input_str):
     return Split_by_num(input_str=input_str,num=2)
@@ -92,22 +93,21 @@ def StrArr2Str(input_str,sub_str = ''):
     return sub_str.join(input_str)
  
 def StrArr2Int(input_str):
-    # print(f'input:{'0x'+StrArr2Str(input_str)}')
-    return int(StrArr2Str(input_str),16)
+    return int(''.join(input_str),16)
+ 
+# CAN-FD payload lengths above 8 bytes
+_FD_DATA_SIZE = (12,16,20,24,36,48,64)
  
 def calculateLength_dlc(input_arr:list):
     """
     Calculate the length of the message must be on CAN-FD
     """
-    Data_size = [12,16,20,24,36,48,64]
     arr_len = len(input_arr)
     if arr_len > 64:
         return 0xff
     elif arr_len <= 8:
         return arr_len
-    for i in range(len(Data_size)):
-        if arr_len <= Data_size[i]:
-            return Data_size[i]
+    return _FD_DATA_SIZE[bisect_left(_FD_DATA_SIZE, arr_len)]
  
 def Correct_Str_Hex(input_str):
     """
@@ -119,10 +119,13 @@ def Correct_Str_Hex(input_str):
 def add_padding(input_arr:list, padding):
     """
     Add padding for a frame CAN-FD
+    padding: pad byte as int, or as hex string (Eg: 'AA')
     """
+    if isinstance(padding, str):
+        padding = int(padding,16)
     Data_size = calculateLength_dlc(input_arr)
-    outdata = list(input_arr)
-    outdata.extend([int(padding,16)]*(Data_size-len(input_arr)))
+    outdata = bytearray(input_arr)
+    outdata += bytes((padding,))*(Data_size-len(input_arr))
     return outdata
  
 def trim(value, min_val, max_val):
@@ -1,13 +1,31 @@
 import os
+import locale
+import mmap
  
+# Same codec open() would use in text mode
+_ENCODING = locale.getpreferredencoding(False)
+ 
+def _read_lines(file_path):
+    """
+    Yield raw byte lines of a file through a read-only memory map
+    """
+    with open(file_path,'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ) as mm:
+            readline = mm.readline
+            while (line := readline()):
+                yield line
  
 def find_lines_with_substrings(file_path,substrings:list):
-    matching_lines = []
-    with open(file_path,'r',errors="ignore") as file:
-        for line in file:
-            if all(substring in line for substring in substrings):
-                matching_lines.append(line.strip().split(" "))
-    return matching_lines
+    # Match on raw bytes and only decode the lines that are kept
+    subs = [substring.encode(_ENCODING) for substring in substrings]
+    if len(subs) == 1:
+        sub = subs[0]
+        lines = [line for line in _read_lines(file_path) if sub in line]
+    else:
+        lines = [line for line in _read_lines(file_path) if all(sub in line for sub in subs)]
+    return [line.decode(_ENCODING,errors="ignore").strip().split(" ") for line in lines]
  
 def find_idx_with_substrings(input_arr,substrings:list):
     matching_lines = 0
@@ -17,9 +35,6 @@ def find_idx_with_substrings(input_arr,substrings:list):
     return matching_lines
  
 def find_lines_begin_with_substring(file_path,substring:str):
-    matching_lines = []
-    with open(file_path,'r') as file:
-        for line in file:
-            if line[:len(substring)] == substring:
-                matching_lines.append(line.strip().split(" "))
-    return matching_lines
\ No newline at end of file
+    prefix = substring.encode(_ENCODING)
+    lines = [line for line in _read_lines(file_path) if line.startswith(prefix)]
+    return [line.decode(_ENCODING).strip().split(" ") for line in lines]
\ No newline at end of file
@@ -1,9 +1,10 @@
 import threading
 import collections
 import math
+import os
+from dataclasses import dataclass, field
 from numbers import Number
-from copy import deepcopy
-from typing import Dict, Any, Optional, Deque, Union
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 
 import cantools
 from cantools.database.can.signal import NamedSignalValue
@@ -12,18 +13,58 @@ from E2E.crc import*
 from COMMON.Cast import*
 from logger.log import*
  
+@dataclass(slots=True)
+class MsgAttrs:
+    """Static E2E/transmission attributes of one DBC message."""
+    periodic: bool
+    on_event: bool
+    group: bool
+    alvcnt: str
+    alvcnt_mask: int
+    crc: str
+    crc_mask: Optional[int]
+    # (byteorder, shift, field mask) to write the CRC straight into the
+    # encoded payload; None falls back to a second encode.
+    crc_patch: Optional[Tuple[str, int, int]] = None
+ 
+@dataclass(slots=True)
+class MsgState:
+    """Everything get_payload/push_signals need for one message, in one place."""
+    msg: Any
+    attrs: MsgAttrs
+    current: Dict[str, Any]
+    initial: Dict[str, Any]
+    trim: Dict[str, Tuple[Any, Any]]
+    # Latest pushed update not yet sent; pushes overwrite, sends consume
+    pending: Optional[Dict[str, Any]] = None
+    # Guards current/pending of this message only, so cyclic TX of different
+    # messages never contends on one adapter-wide lock.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+ 
 class DBCAdapter:
     def __init__(self, dbc_path: str):
-        self.db = cantools.database.load_file(dbc_path)
+        # Opt-in parsed-DBC cache (cantools/diskcache, keyed on path + mtime)
+        cache_dir = os.environ.get("CANX_DBC_CACHE_DIR")
+        if cache_dir:
+            self.db = cantools.database.load_file(dbc_path, cache_dir=cache_dir)
+        else:
+            self.db = cantools.database.load_file(dbc_path)
         self.lock = threading.Lock()
-        self.messages_atrributes: Dict[str,Dict[str, Any]] = {}
-        self.signal_queues: Dict[str, Deque[Dict[str, Any]]] = {}
-        self.nodes: Dict[str,Dict[str]] = {}
-        self.receivers: Dict[str,Dict[str]] = {}
+        self.messages_atrributes: Dict[str, MsgAttrs] = {}
+        nodes = collections.defaultdict(list)
+        receivers = collections.defaultdict(list)
         self.current_signals: Dict[str,Dict[str, Any]] = {}
         self.initial: Dict[str,Dict[str,Any]] = {}
-        self.message_trim: Dict[str, Dict[str,Any]] = {}
+        self.message_trim: Dict[str, Dict[str, Tuple[Any, Any]]] = {}
         self.message_cache = {}
+        self.state_by_name: Dict[str, MsgState] = {}
+        self.state_by_id: Dict[int, MsgState] = {}
+        # Dense slot per message: resolve once, then index the list directly
+        self.states: List[MsgState] = []
+        self.idx_by_name: Dict[str, int] = {}
+        self.idx_by_id: Dict[int, int] = {}
+        # Per-slot encoder specialised for the message's E2E needs
+        self.encoders: List[Callable[[], bytes]] = []
  
  
         for msg in self.db.messages:
@@ -31,52 +72,79 @@ class DBCAdapter:
             self.initial[msg.name] = {}
             self.message_trim[msg.name] = {}
             self.message_cache[msg.frame_id] = msg
-            for sig in msg.signals:
-                sig_initial = 0
-                try:
-                    sig_initial = int(sig.raw_initial)
-                except:
-                    pass
-                min_val, max_val = self._resolve_signal_limits(sig)
-                initial_value = trim((sig_initial*sig.scale + sig.offset), min_val, max_val)
-                self.current_signals[msg.name][sig.name] = initial_value
-                self.initial[msg.name][sig.name] = initial_value
-                self.message_trim[msg.name][sig.name] = {"minimum": min_val, "maximum": max_val}
- 
-            
             for sender in msg.senders:
-                if sender not in self.nodes:
-                    self.nodes[sender] = [msg.name]
-                else:
-                    self.nodes[sender].append(msg.name)
+                nodes[sender].append(msg.name)
             for receiver in msg.receivers:
-                if receiver not in self.receivers:
-                    self.receivers[receiver] = [msg.name]
-                else:
-                    self.receivers[receiver].append(msg.name)
+                receivers[receiver].append(msg.name)
             grp = False
             alvcnt = ""
-            alv_len = 0
+            alv_mask = 0
             crc = ""
             crc_mask = None
+            crc_patch = None
             for sig in msg.signals:
-                if "AlvCnt" in sig.name:
+                raw_initial = sig.raw_initial
+                sig_initial = int(raw_initial) if isinstance(raw_initial, (int, float)) else 0
+                min_val, max_val = self._resolve_signal_limits(sig)
+                initial_value = trim((sig_initial*sig.scale + sig.offset), min_val, max_val)
+                self.current_signals[msg.name][sig.name] = initial_value
+                self.initial[msg.name][sig.name] = initial_value
+                self.message_trim[msg.name][sig.name] = (min_val, max_val)
+                # E2E roles are identified by name in the same pass
+                name = sig.name
+                if "AlvCnt" in name:
                     grp = True
-                    alvcnt = sig.name
-                    alv_len = (1<<sig.length)-1
-                elif "Crc" in sig.name:
-                    crc = sig.name
+                    alvcnt = name
+                    alv_mask = (1 << sig.length) - 1
+                elif "Crc" in name:
+                    crc = name
                     crc_mask = (1 << sig.length) - 1 if sig.length else None
+                    crc_patch = self._crc_patch(msg, sig)
             cmt = msg.comment if msg.comment else ""
-            self.messages_atrributes[msg.name] = {
-                "Periodic": True if msg.send_type == "Cyclic" else False,
-                "On_event" : True if "Event" in cmt else False,
-                "Group": grp,
-                "AlvCnt": alvcnt,
-                "CRC": crc,
-                "CRC_mask": crc_mask
-            }
-            self.signal_queues[msg.name] = collections.deque(maxlen=1)
+            self.messages_atrributes[msg.name] = MsgAttrs(
+                periodic=msg.send_type == "Cyclic",
+                on_event="Event" in cmt,
+                group=grp,
+                alvcnt=alvcnt,
+                alvcnt_mask=alv_mask,
+                crc=crc,
+                crc_mask=crc_mask,
+                crc_patch=crc_patch,
+            )
+            state = MsgState(
+                msg=msg,
+                attrs=self.messages_atrributes[msg.name],
+                current=self.current_signals[msg.name],
+                initial=self.initial[msg.name],
+                trim=self.message_trim[msg.name],
+            )
+            self.state_by_name[msg.name] = state
+            self.state_by_id[msg.frame_id] = state
+            self.idx_by_name[msg.name] = self.idx_by_id[msg.frame_id] = len(self.states)
+            self.states.append(state)
+            self.encoders.append(self._make_encoder(state))
+        self.nodes: Dict[str, list] = dict(nodes)
+        self.receivers: Dict[str, list] = dict(receivers)
+
+    @staticmethod
+    def _crc_patch(msg, sig) -> Optional[Tuple[str, int, int]]:
+        """Locate a CRC signal inside the encoded payload as an integer bit field.
+
+        Only plain unsigned raw signals (scale 1, offset 0) can be patched
+        without going through cantools again.
+        """
+
+        if not sig.length or sig.is_signed or getattr(sig, "is_float", False):
+            return None
+        if sig.scale != 1 or sig.offset != 0:
+            return None
+        field = (1 << sig.length) - 1
+        if sig.byte_order == "little_endian":
+            return "little", sig.start, field << sig.start
+        # Motorola: DBC start bit is the MSB in sawtooth numbering.
+        msb = 8 * (sig.start // 8) + (7 - sig.start % 8)
+        shift = 8 * msg.length - (msb + sig.length)
+        return "big", shift, field << shift
 
     def _resolve_signal_limits(self, sig):
         """Provide fallback physical min/max values even when the DBC omits them."""
@@ -140,84 +208,133 @@ class DBCAdapter:
         return None, False
 
     def push_signals(self, message_name: str, signals: Dict[str,Any]):
-        with self.lock:
-            if message_name not in self.signal_queues:
-                raise KeyError(f"Message {message_name} not found in DBC")
+        state = self.state_by_name.get(message_name)
+        if state is None:
+            raise KeyError(f"Message {message_name} not found in DBC")
 
-            trimmed_signals: Dict[str, Any] = {}
-            for signal, value in signals.items():
-                normalized_value, is_numeric = self._sanitize_signal_value(signal, value)
-                if normalized_value is None:
-                    continue
-                try:
-                    if is_numeric:
-                        normalized_value = trim(
-                            normalized_value,
-                            self.message_trim[message_name][signal]["minimum"],
-                            self.message_trim[message_name][signal]["maximum"],
-                        )
-                except Exception as e:
-                    logger.error(f"[ERROR] Failed to push signal {signal}: {e}")
+        bounds = state.trim
+        trimmed_signals: Dict[str, Any] = {}
+        for signal, value in signals.items():
+            normalized_value, is_numeric = self._sanitize_signal_value(signal, value)
+            if normalized_value is None:
+                continue
+            if is_numeric:
+                limits = bounds.get(signal)
+                if limits is None:
+                    logger.error(f"[ERROR] Failed to push signal {signal}: unknown signal")
                     continue
-                trimmed_signals[signal] = normalized_value
-            self.current_signals[message_name].update(trimmed_signals)
-            self.signal_queues[message_name].append(trimmed_signals)
+                # _resolve_signal_limits always yields both bounds
+                lo, hi = limits
+                normalized_value = min(max(lo, normalized_value), hi)
+            trimmed_signals[signal] = normalized_value
+        with state.lock:
+            state.current.update(trimmed_signals)
+            state.pending = trimmed_signals
 
     def get_payload(self, msg_id: Union[int, str]) -> bytes:
         if isinstance(msg_id, str):
-            msg = self.db.get_message_by_name(msg_id)
-        else:
-            msg = self.message_cache[msg_id]
-        message_name = msg.name
-        attrs = self.messages_atrributes[message_name]
-        alvcnt_name = attrs["AlvCnt"] if attrs["Group"] else None
-        alvcnt_update = attrs["Group"] and not attrs["On_event"]
+            return self.get_payload_by_idx(self.idx_by_name[msg_id])
+        return self.get_payload_by_idx(self.idx_by_id[msg_id])
 
-        with self.lock:
-            if self.signal_queues[message_name]:
-                updates = self.signal_queues[message_name].popleft()
-                self.current_signals[message_name].update(updates)
-                if attrs["Group"]:
-                    alvcnt_update = True
+    def get_payload_by_idx(self, idx: int) -> bytes:
+        """Encode the message in slot ``idx`` (see ``idx_by_id``/``idx_by_name``)."""
+        return self.encoders[idx]()
 
-            if alvcnt_update and alvcnt_name:
-                alvcnt = ((self.current_signals[message_name][alvcnt_name] + 1) & 0xff)
-                self.current_signals[message_name][alvcnt_name] = alvcnt
+    @staticmethod
+    def _make_encoder(state: MsgState) -> Callable[[], bytes]:
+        """Build the encoder for one message with only the E2E steps it needs.
 
-            signals_snapshot = self.current_signals[message_name].copy()
+        Plain messages skip the AlvCnt/CRC branches entirely; the choice is
+        made once here instead of on every cyclic send.
+        """
+        msg = state.msg
+        encode = msg.encode
+        frame_id = msg.frame_id
+        attrs = state.attrs
+        current = state.current
+        lock = state.lock
+        group = attrs.group
+        alvcnt_name = attrs.alvcnt if group else None
+        alvcnt_cyclic = group and not attrs.on_event
+        alvcnt_mask = attrs.alvcnt_mask
 
-        payload = msg.encode(signals_snapshot)
+        def _encode_plain() -> bytes:
+            with lock:
+                updates = state.pending
+                if updates is not None:
+                    state.pending = None
+                    current.update(updates)
+                signals_snapshot = current.copy()
+            return encode(signals_snapshot)
 
-        crc_name = attrs["CRC"]
-        crc_mask = attrs.get("CRC_mask")
-        if crc_name:
-            data_bytes = bytearray(payload)
-            crc_calc = crc_calculate_cy(msg.frame_id, data_bytes)
+        def _encode_group() -> bytes:
+            with lock:
+                alvcnt_update = alvcnt_cyclic
+                updates = state.pending
+                if updates is not None:
+                    state.pending = None
+                    current.update(updates)
+                    alvcnt_update = True
+                if alvcnt_update:
+                    current[alvcnt_name] = (current[alvcnt_name] + 1) & alvcnt_mask
+                signals_snapshot = current.copy()
+            return encode(signals_snapshot)
+
+        crc_name = attrs.crc
+        crc_mask = attrs.crc_mask
+        crc_patch = attrs.crc_patch
+        suffix = crc_suffix(frame_id)
+
+        def _encode_crc() -> bytes:
+            with lock:
+                alvcnt_update = alvcnt_cyclic
+                updates = state.pending
+                if updates is not None:
+                    state.pending = None
+                    current.update(updates)
+                    if group:
+                        alvcnt_update = True
+                if alvcnt_update and alvcnt_name:
+                    current[alvcnt_name] = (current[alvcnt_name] + 1) & alvcnt_mask
+                signals_snapshot = current.copy()
 
+            payload = encode(signals_snapshot)
+            crc_calc = crc_calculate_with_suffix(suffix, payload)
             if crc_mask is not None:
                 crc_calc &= crc_mask
 
-            signals_snapshot[crc_name] = crc_calc
-            with self.lock:
-                self.current_signals[message_name][crc_name] = crc_calc
-            payload = msg.encode(signals_snapshot)
+            with lock:
+                current[crc_name] = crc_calc
+            if crc_patch is None:
+                signals_snapshot[crc_name] = crc_calc
+                return encode(signals_snapshot)
+            byteorder, shift, field = crc_patch
+            value = (int.from_bytes(payload, byteorder) & ~field) | (crc_calc << shift)
+            return value.to_bytes(len(payload), byteorder)
+
+        if crc_name:
+            return _encode_crc
+        if alvcnt_name:
+            return _encode_group
+        return _encode_plain
 
-        return payload
     def reset_message(self, message_name: Optional[str] = None):
         with self.lock:
             try:
-                if message_name:
-                    self.current_signals[message_name] = deepcopy(self.initial[message_name])
-                    self.signal_queues[message_name].clear()
-                else:
-                    self.current_signals = {msg: deepcopy(signals) for msg, signals in self.initial.items()}
-                    for msg in self.signal_queues.keys():
-                        self.signal_queues[msg].clear()
+                # Reset in place so MsgState and current_signals keep sharing
+                # the same dict objects. current always holds exactly the
+                # initial keys, so overwriting values never resizes the dict
+                # that Message_dict() hands out to unlocked readers.
+                states = [self.state_by_name[message_name]] if message_name else self.state_by_name.values()
+                for state in states:
+                    with state.lock:
+                        state.current.update(state.initial)
+                        state.pending = None
             except Exception as e:
                 logger.error(f"[RESET] Failed to reset message {message_name}: {e}")
     def decode_message(self, message_id: int, data: bytes) -> Dict[str, Any]:
         try:
-            msg = self.db.get_message_by_frame_id(message_id)
+            msg = self.message_cache[message_id]
             signals = msg.decode(data)
             return signals
         except Exception as e:
@@ -237,20 +354,16 @@ class DBCAdapter:
         return self.db.messages
     def Message_attributes(self, frame_id_or_name : Union[int,str]):
         if isinstance(frame_id_or_name, int):
-            message = self.db.get_message_by_frame_id(frame_id_or_name)
+            message = self.state_by_id[frame_id_or_name].msg
         elif isinstance(frame_id_or_name, str):
-            message = self.db.get_message_by_name(frame_id_or_name)
+            message = self.state_by_name[frame_id_or_name].msg
         else:
             raise ValueError(f"Invalid frame_id_or_name '{frame_id_or_name}'")
         return message
  
     def get_message_id_by_name(self, msg_name):
-        message = self.db.get_message_by_name(msg_name)
-        return message.frame_id
+        return self.state_by_name[msg_name].msg.frame_id
     def isOnEvent(self, frame_id_or_name):
         if isinstance(frame_id_or_name, int):
-            message = self.db.get_message_by_frame_id(frame_id_or_name)
-            frame_id_or_name = message.name
-        elif isinstance(frame_id_or_name, str):
-            pass
-        return self.messages_atrributes[frame_id_or_name]["On_event"]
\ No newline at end of file
+            return self.state_by_id[frame_id_or_name].attrs.on_event
+        return self.messages_atrributes[frame_id_or_name].on_event
\ No newline at end of file
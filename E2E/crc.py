@@ -4,7 +4,13 @@ Description: This lib provide crc calulate functions
 Last update: 22-Jan-2025
     - First Initial
 '''
-from E2E.CRC.crc_cy import crc16_canfd_cy
+import binascii
+import struct
+
+try:
+    from E2E.CRC.crc_cy import crc16_canfd_cy
+except ImportError:  # extension not built for this platform
+    crc16_canfd_cy = None
 
 CRC_17_POLY = 0x1685B
 CRC_17_INIT = 0x1FFFF
@@ -13,6 +19,9 @@ CRC17_WIDTH = 17
 CRC_16_POLY = 0x1021
 CRC_16_INIT = 0xFFFF
 CRC_16_FINAL_XOR = 0x0
+
+# Message-id suffix appended to the CRC input, little endian
+_SUFFIX = struct.Struct("<H")
 CRC16_WIDTH = 16
 
 
@@ -23,30 +32,34 @@ def reflect(data, n_bits):
         data >>= 1
     return reflection
  
+def _crc17_nibble_entry(nibble):
+    crc = nibble << (CRC17_WIDTH - 4)
+    for _ in range(4):
+        if crc & (1 << (CRC17_WIDTH - 1)):
+            crc = (crc<<1)^CRC_17_POLY
+        else:
+            crc <<= 1
+    return crc & ((1 << CRC17_WIDTH) - 1)
+ 
 def crc17_canfd(data):
+    # Two 4-bit table steps per byte instead of eight bit steps
+    table = _CRC17_NIBBLE
+    mask = (1 << CRC17_WIDTH) - 1
+    shift = CRC17_WIDTH - 4
     crc = CRC_17_INIT
     for byte in data:
         crc ^= (_REFLECT_BYTE[byte] << (CRC17_WIDTH - 8))
-        for _ in range(8):
-            if crc & (1 << (CRC17_WIDTH - 1)):
-                crc = (crc<<1)^CRC_17_POLY
-            else:
-                crc <<= 1
-    crc &= (1 << CRC17_WIDTH) - 1
-    return reflect(crc, CRC17_WIDTH)
+        crc = ((crc << 4) & mask) ^ table[crc >> shift]
+        crc = ((crc << 4) & mask) ^ table[crc >> shift]
+    # 17-bit reflection composed from the byte table
+    return ((_REFLECT_BYTE[crc & 0xFF] << 9)
+            | (_REFLECT_BYTE[(crc >> 8) & 0xFF] << 1)
+            | ((crc >> 16) & 1))
  
 def crc16_canfd(data):
-    crc = CRC_16_INIT
-    for byte in data:
-        crc ^= (byte << (CRC16_WIDTH - 8))
-        for _ in range(8):
-            if crc & (1 << (CRC16_WIDTH - 1)):
-                crc = (crc<<1)^CRC_16_POLY
-            else:
-                crc <<= 1
-    crc &= (1 << CRC16_WIDTH) - 1
-    crc ^= CRC_16_FINAL_XOR
-    return crc
+    # CRC-16/CCITT-FALSE (poly 0x1021, no reflection) is exactly what
+    # binascii.crc_hqx computes in C when seeded with CRC_16_INIT.
+    return binascii.crc_hqx(data, CRC_16_INIT) ^ CRC_16_FINAL_XOR
 
 def hex2byte(hex_str):
     hex_str = hex_str.strip().replace(" ", "")
@@ -66,29 +79,47 @@ def _build_crc_payload(msg_id, data_frame):
         raise TypeError("data_frame must be bytes-like")
     if len(data_frame) < 2:
         raise ValueError("data_frame must contain at least two bytes")
-    suffix = (0xF800 + msg_id) & 0x0FFF
-    payload = bytearray(data_frame[2:])
-    payload.append(suffix & 0xFF)
-    payload.append((suffix >> 8) & 0xFF)
-    return bytes(payload)
+    return bytes(data_frame[2:]) + crc_suffix(msg_id)
+
+
+def crc_suffix(msg_id):
+    """
+    2-byte message-id suffix appended to the CRC input.
+    Constant per message, so callers may compute it once.
+    """
+    return _SUFFIX.pack((0xF800 + msg_id) & 0x0FFF)
 
 
 def crc_calculate(msg_id, data_frame):
     """
     msg_id : int (Eg: 0x7b3)
     data_frame : bytes (Eg: b'\x00\x00\x00')
+    Uses the slicing-by-8 Cython kernel when it is built.
     """
     payload = _build_crc_payload(msg_id, data_frame)
-    return crc16_canfd(payload)
+    return _crc16_fast(payload)
 
 
-def crc_calculate_cy(msg_id, data_frame):
+def crc_calculate_with_suffix(suffix, data_frame):
     """
-    msg_id : int (Eg: 0x7b3)
-    data_frame : bytes (Eg: b'\x00\x00\x00')
+    suffix : bytes from crc_suffix(msg_id)
+    data_frame : encoded payload, at least two bytes
+    Same result as crc_calculate without redoing the msg_id work per frame.
+    """
+    return _crc16_fast(bytes(data_frame[2:]) + suffix)
+
+
+def crc_calculate_ref(msg_id, data_frame):
+    """
+    Reference version of crc_calculate that never uses the Cython kernel
     """
     payload = _build_crc_payload(msg_id, data_frame)
-    return crc16_canfd_cy(payload)
+    return crc16_canfd(payload)
+
 
+# Kept for callers of the former Cython-only entry point
+crc_calculate_cy = crc_calculate
 
+_crc16_fast = crc16_canfd_cy if crc16_canfd_cy is not None else crc16_canfd
 _REFLECT_BYTE = tuple(reflect(i, 8) for i in range(256))
+_CRC17_NIBBLE = tuple(_crc17_nibble_entry(i) for i in range(16))
@@ -1,28 +1,113 @@
 #include <windows.h>
 #include <iostream>
- 
+#include <string>
+#include <cstdio>
+#include <cstring>
+
 typedef void (__stdcall *ASK_KeyGenerate_FUNC)(unsigned char*, unsigned char*);
- 
+
+// Parse up to 8 seed bytes from a hex string (same layout as the one-shot path)
+static void parse_seed(const char* seedHex, unsigned char seed[8]) {
+    memset(seed, 0, 8);
+    sscanf(seedHex, "%02hhX%02hhX%02hhX%02hhX%02hhX%02hhX%02hhX%02hhX",
+           &seed[0], &seed[1], &seed[2], &seed[3], &seed[4], &seed[5], &seed[6], &seed[7]);
+}
+
+static void print_key(const unsigned char keyBuffer[8]) {
+    for (int i = 0; i < 8; i++) {
+        printf("%02X", keyBuffer[i]);
+    }
+    printf("\n");
+}
+
+// --serve: print READY, then answer every "dll_path<TAB>seed_hex" line on
+// stdin with the key as plain hex (or "ERR <reason>"). The last DLL stays
+// loaded, so repeated requests skip LoadLibrary/GetProcAddress.
+static int serve() {
+    std::string loadedPath;
+    HMODULE hLib = NULL;
+    ASK_KeyGenerate_FUNC ASK_KeyGenerate = NULL;
+
+    printf("READY\n");
+    fflush(stdout);
+
+    std::string line;
+    while (std::getline(std::cin, line)) {
+        if (!line.empty() && line[line.size() - 1] == '\r') {
+            line.erase(line.size() - 1);
+        }
+        if (line.empty()) {
+            continue;
+        }
+        size_t tab = line.find('\t');
+        if (tab == std::string::npos) {
+            printf("ERR expected <dll_path>\\t<seed_hex>\n");
+            fflush(stdout);
+            continue;
+        }
+        std::string dllPath = line.substr(0, tab);
+        std::string seedHex = line.substr(tab + 1);
+
+        if (!hLib || dllPath != loadedPath) {
+            if (hLib) {
+                FreeLibrary(hLib);
+                hLib = NULL;
+                ASK_KeyGenerate = NULL;
+                loadedPath.clear();
+            }
+            hLib = LoadLibraryA(dllPath.c_str());
+            if (!hLib) {
+                printf("ERR Failed to load 32-bit DLL. GetLastError() = %lu\n", GetLastError());
+                fflush(stdout);
+                continue;
+            }
+            ASK_KeyGenerate = (ASK_KeyGenerate_FUNC)GetProcAddress(hLib, "ASK_KeyGenerate");
+            if (!ASK_KeyGenerate) {
+                printf("ERR Failed to find function 'ASK_KeyGenerate'. GetLastError() = %lu\n", GetLastError());
+                fflush(stdout);
+                FreeLibrary(hLib);
+                hLib = NULL;
+                continue;
+            }
+            loadedPath = dllPath;
+        }
+
+        unsigned char seed[8];
+        unsigned char keyBuffer[8] = {0};
+        parse_seed(seedHex.c_str(), seed);
+        ASK_KeyGenerate(seed, keyBuffer);
+        print_key(keyBuffer);
+        fflush(stdout);
+    }
+
+    if (hLib) {
+        FreeLibrary(hLib);
+    }
+    return 0;
+}
+
 int main(int argc, char* argv[]) {
+    if (argc == 2 && strcmp(argv[1], "--serve") == 0) {
+        return serve();
+    }
     if (argc != 3) {
-        std::cerr << "Usage: Helper32.exe <dll_path> <seed_hex>" << std::endl;
+        std::cerr << "Usage: Helper32.exe <dll_path> <seed_hex> | Helper32.exe --serve" << std::endl;
         return -1;
     }
- 
+
     const char* dllPath = argv[1];
- 
+
     // Convert seed from hex string to bytes
     unsigned char seed[8];
-    sscanf(argv[2], "%02hhX%02hhX%02hhX%02hhX%02hhX%02hhX%02hhX%02hhX",
-           &seed[0], &seed[1], &seed[2], &seed[3], &seed[4], &seed[5], &seed[6], &seed[7]);
- 
+    parse_seed(argv[2], seed);
+
     // Load the 32-bit DLL dynamically
     HMODULE hLib = LoadLibraryA(dllPath);
     if (!hLib) {
         std::cerr << "Error: Failed to load 32-bit DLL. GetLastError() = " << GetLastError() << std::endl;
         return -1;
     }
- 
+
     // Get the address of the function
     ASK_KeyGenerate_FUNC ASK_KeyGenerate = (ASK_KeyGenerate_FUNC)GetProcAddress(hLib, "ASK_KeyGenerate");
     if (!ASK_KeyGenerate) {
@@ -30,21 +115,17 @@ int main(int argc, char* argv[]) {
         FreeLibrary(hLib);
         return -2;
     }
- 
+
     // Prepare the output buffer
     unsigned char keyBuffer[8] = {0};
- 
+
     // Call the function
     ASK_KeyGenerate(seed, keyBuffer);
- 
+
     // Print the computed key (so Python can read it)
-    for (int i = 0; i < 8; i++) {
-        printf("%02X", keyBuffer[i]);
-    }
-    printf("\n");
- 
+    print_key(keyBuffer);
+
     // Free the DLL
     FreeLibrary(hLib);
     return 0;
 }
- 
\ No newline at end of file
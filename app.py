@@ -2,13 +2,16 @@ import json
 import os
 import time
 import math
+import queue
+import re
 import threading
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 from decimal import Decimal
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 from werkzeug.utils import secure_filename
 
@@ -18,10 +21,13 @@ from backend.panel_api import panel_bp
 from CANIF.CANInterface import CANInterface
 from CANTP.CANTP import CANTP
 from COMDIAG.ComDia import ComDiag
-from COMMON.Cast import Hex, HexArr2Str
+from COMMON.Cast import Hex
 from cantools.database.can.signal import NamedSignalValue
 
 
+_INT_PREFIX_BASES = {"0x": 16, "0b": 2, "0o": 8}
+
+
 def _coerce_number(value):
     if value is None:
         return None
@@ -33,14 +39,16 @@ def _coerce_number(value):
         return None
     if not value:
         return None
+    return _parse_number_text(value)
+
+
+@lru_cache(maxsize=1024)
+def _parse_number_text(value):
+    base = _INT_PREFIX_BASES.get(value[:2].lower())
     try:
-        if value.startswith("0x") or value.startswith("0X"):
-            return int(value, 16)
-        if value.startswith("0b") or value.startswith("0B"):
-            return int(value, 2)
-        if value.startswith("0o") or value.startswith("0O"):
-            return int(value, 8)
-        if "." in value or "e" in value.lower():
+        if base:
+            return int(value, base)
+        if "." in value or "e" in value or "E" in value:
             return float(value)
         return int(value)
     except ValueError:
@@ -58,6 +66,51 @@ def _signal_attr(signal, attr: str, default=None):
     return default
 
 
+# Per-signal/message derived data, keyed by id(obj). The object itself is
+# kept in the entry so a recycled id can never hit a stale value.
+_SCALE_OFFSET_CACHE: dict[int, tuple] = {}
+_BOUNDS_CACHE: dict[int, tuple] = {}
+_SIGLOOKUP_CACHE: dict[int, tuple] = {}
+_STATIC_INFO_CACHE: dict[int, tuple] = {}
+_MESSAGE_ENTRY_CACHE: dict[int, tuple] = {}
+
+
+def _cached_by_identity(cache, obj, compute):
+    if isinstance(obj, dict):
+        # Plain dicts are mutable; always recompute
+        return compute(obj)
+    entry = cache.get(id(obj))
+    if entry is not None and entry[0] is obj:
+        return entry[1]
+    value = compute(obj)
+    cache[id(obj)] = (obj, value)
+    return value
+
+
+def _clear_signal_caches():
+    _SCALE_OFFSET_CACHE.clear()
+    _BOUNDS_CACHE.clear()
+    _SIGLOOKUP_CACHE.clear()
+    _STATIC_INFO_CACHE.clear()
+    _MESSAGE_ENTRY_CACHE.clear()
+
+
+def _signal_scale_offset(signal):
+    """Return (scale, offset) as plain numbers, scale defaulting to 1."""
+    return _cached_by_identity(_SCALE_OFFSET_CACHE, signal, _compute_scale_offset)
+
+
+def _plain_number(value):
+    """Turn DBC Decimal attributes into floats; anything else is returned as-is."""
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _compute_scale_offset(signal):
+    scale = _plain_number(_signal_attr(signal, "scale"))
+    offset = _plain_number(_signal_attr(signal, "offset") or 0)
+    return (scale if scale not in (None, 0) else 1), offset
+
+
 def _physical_to_raw(signal, physical):
     if physical is None:
         return None
@@ -67,15 +120,7 @@ def _physical_to_raw(signal, physical):
         return None
     if isinstance(physical, float) and not math.isfinite(physical):
         return None
-    scale = _signal_attr(signal, "scale")
-    if isinstance(scale, Decimal):
-        scale = float(scale)
-    scale = scale if scale not in (None, 0) else 1
-    offset = _signal_attr(signal, "offset") or 0
-    if isinstance(offset, Decimal):
-        offset = float(offset)
-    if scale == 0:
-        return physical
+    scale, offset = _signal_scale_offset(signal)
     try:
         raw = (physical - offset) / scale
     except TypeError:
@@ -94,13 +139,7 @@ def _raw_to_physical(signal, raw):
         return None
     if isinstance(raw, float) and not math.isfinite(raw):
         return None
-    scale = _signal_attr(signal, "scale")
-    if isinstance(scale, Decimal):
-        scale = float(scale)
-    scale = scale if scale not in (None, 0) else 1
-    offset = _signal_attr(signal, "offset") or 0
-    if isinstance(offset, Decimal):
-        offset = float(offset)
+    scale, offset = _signal_scale_offset(signal)
     try:
         return raw * scale + offset
     except TypeError:
@@ -124,20 +163,9 @@ def _normalize_physical(signal, value):
 
 
 def _infer_physical_bounds(signal, bounds):
-    scale = _signal_attr(signal, "scale")
-    offset = _signal_attr(signal, "offset")
-    if isinstance(scale, Decimal):
-        scale = float(scale)
-    if isinstance(offset, Decimal):
-        offset = float(offset)
-    scale = scale if scale not in (None, 0) else 1
-    offset = offset or 0
-    physical_min = _signal_attr(signal, "minimum")
-    physical_max = _signal_attr(signal, "maximum")
-    if isinstance(physical_min, Decimal):
-        physical_min = float(physical_min)
-    if isinstance(physical_max, Decimal):
-        physical_max = float(physical_max)
+    scale, offset = _signal_scale_offset(signal)
+    physical_min = _plain_number(_signal_attr(signal, "minimum"))
+    physical_max = _plain_number(_signal_attr(signal, "maximum"))
     signed_min = bounds.get("raw_signed_min")
     signed_max = bounds.get("raw_signed_max")
     if physical_min is None and signed_min is not None:
@@ -173,8 +201,8 @@ def _signal_unsigned(raw, bit_length):
         raw_int = int(raw)
     except (TypeError, ValueError, OverflowError):
         return None
-    modulus = 1 << bit_length
-    return raw_int % modulus
+    # Two's-complement wrap; same as % (1 << bit_length) for Python ints
+    return raw_int & ((1 << bit_length) - 1)
 
 
 def _signal_signed(raw_unsigned, bit_length, is_signed):
@@ -209,6 +237,11 @@ def _format_raw_hex(raw_unsigned, bit_length):
 
 
 def _signal_bounds(signal):
+    """Raw bounds of a signal; the returned dict is shared, do not mutate."""
+    return _cached_by_identity(_BOUNDS_CACHE, signal, _compute_signal_bounds)
+
+
+def _compute_signal_bounds(signal):
     bit_length = _signal_bit_length(signal)
     is_signed = _signal_is_signed(signal)
     if bit_length is None or bit_length <= 0:
@@ -315,11 +348,7 @@ def _message_is_running(message):
             msg_id_int = int(str(msg_id), 16)
         except (TypeError, ValueError):
             return False
-    try:
-        tasks = getattr(scheduler, "tasks", {}) if scheduler else {}
-        return bool(tasks.get(msg_id_int))
-    except Exception:
-        return False
+    return scheduler.is_running(msg_id_int) if scheduler else False
 
 
 def normalize_choices(choices: dict) -> dict:
@@ -364,11 +393,20 @@ def normalize_for_json(obj):
 
 
 def _json_safe(value):
-    value = normalize_for_json(value)
+    """Make *value* JSON-friendly in a single walk of the tree.
+
+    Same result as normalize_for_json followed by the Decimal/non-finite
+    clean-up, without re-normalizing each subtree at every level.
+    """
+    value_type = type(value)
+    if value is None or value_type is str or value_type is int or value_type is bool:
+        return value
     if isinstance(value, float):
         if not math.isfinite(value):
             return None
         return value
+    if isinstance(value, NamedSignalValue):
+        return value.name
     if isinstance(value, Decimal):
         return float(value)
     if isinstance(value, dict):
@@ -381,18 +419,44 @@ def _json_safe(value):
             safe_key = str(key) if not isinstance(key, str) else key
             safe_dict[safe_key] = _json_safe(val)
         return safe_dict
-    if isinstance(value, (list, tuple)):
+    if isinstance(value, (list, tuple, set)):
         return [_json_safe(v) for v in value]
+    if hasattr(value, "name") and hasattr(value, "value"):
+        try:
+            return value.name
+        except Exception:
+            return str(value)
     return value
 
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Optional deployment knobs: e.g. SOCKETIO_ASYNC_MODE=eventlet together with
+# SOCKETIO_MESSAGE_QUEUE=redis://localhost:6379/0 to fan out across workers.
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode=os.environ.get("SOCKETIO_ASYNC_MODE") or None,
+    message_queue=os.environ.get("SOCKETIO_MESSAGE_QUEUE") or None,
+)
 
 UPLOAD_ROOT = Path(tempfile.gettempdir()) / "canx_uploads"
+_HEX_RE = re.compile(r"[0-9A-Fa-f]*")
+# Traffic cycles through a bounded set of CAN ids; format each one once
+_hex_id = lru_cache(maxsize=4096)(Hex)
 
 
 class AppState:
+    __slots__ = (
+        "canif",
+        "cantp",
+        "diag",
+        "trace_thread",
+        "trace_running",
+        "decode_enabled",
+        "msg_to_dict",
+        "temp_files",
+    )
+
     def __init__(self) -> None:
         self.canif: CANInterface | None = None
         self.cantp: CANTP | None = None
@@ -401,6 +465,8 @@ class AppState:
         self.trace_thread: threading.Thread | None = None
         self.trace_running: bool = False
         self.decode_enabled: bool = True
+        # Trace converter specialised for the current canif/decode flag
+        self.msg_to_dict = None
 
         self.temp_files: set[str] = set()
 
@@ -410,77 +476,196 @@ app.config['CANX_STATE'] = state
 app.register_blueprint(panel_bp, url_prefix="/api/panel")
 
 
-def _msg_to_dict(msg, *, direction: str = "rx") -> Dict[str, Any]:
-    try:
-        data_str = HexArr2Str(msg.data)
-    except Exception:
-        data_str = ""
-    decoded = None
-    if state.decode_enabled and state.canif and state.canif.dbc:
-        try:
-            raw_decoded = state.canif.dbc.decode_message(msg.arbitration_id, msg.data)
-            decoded = _json_safe(raw_decoded)
-        except Exception:
-            decoded = None
-    direction_label = "TX" if str(direction).lower() == "tx" else "RX"
-    is_fd = bool(getattr(msg, "is_fd", False))
-    frame_name: str | None = None
-    dbc = getattr(state.canif, "dbc", None)
-    signal_details = []
+def _build_msg_to_dict(decode_enabled: bool, canif):
+    """Return a frame -> trace dict converter specialised for *canif*.
+
+    Whether to decode and which DBC to use are fixed per CAN interface, so
+    they are resolved here once instead of on every frame.
+    """
+    dbc = getattr(canif, "dbc", None)
+    decode_message = dbc.decode_message if dbc and decode_enabled else None
     if dbc:
         try:
-            cached_msg = dbc.message_cache.get(msg.arbitration_id)
+            lookup_cached = dbc.message_cache.get
         except Exception:
-            cached_msg = None
-        target_msg = cached_msg
-        if target_msg is None:
+            lookup_cached = None
+        lookup_db = getattr(getattr(dbc, "db", None), "get_message_by_frame_id", None)
+
+    # Cyclic traffic repeats the same (id, payload) pairs, so the hex dump,
+    # decoded signals and their details are computed once per distinct frame.
+    @lru_cache(maxsize=4096)
+    def describe(arbitration_id, payload):
+        data_str = payload.hex(" ").upper()
+        if data_str:
+            data_str += " "
+        decoded = None
+        if decode_message is not None:
+            try:
+                decoded = _json_safe(decode_message(arbitration_id, payload))
+            except Exception:
+                decoded = None
+        frame_name: str | None = None
+        signal_details = []
+        if dbc:
             try:
-                target_msg = dbc.db.get_message_by_frame_id(msg.arbitration_id)
+                target_msg = lookup_cached(arbitration_id)
             except Exception:
                 target_msg = None
-        if target_msg is not None:
-            frame_name = getattr(target_msg, "name", None)
-            signal_details = _resolve_signal_details(target_msg, decoded if isinstance(decoded, dict) else None)
-    return {
-        "ts": time.time(),
-        "id": Hex(msg.arbitration_id),
-        "dlc": len(msg.data) if getattr(msg, "data", None) is not None else 0,
-        "data": data_str,
-        "is_extended": bool(getattr(msg, "is_extended_id", False)),
-        "is_fd": is_fd,
-        "frame_type": "CAN FD" if is_fd else "CAN",
-        "direction": direction_label,
-        "frame_name": frame_name,
-        "decoded": decoded,
-        "signals": signal_details,
-    }
+            if target_msg is None:
+                try:
+                    target_msg = lookup_db(arbitration_id)
+                except Exception:
+                    target_msg = None
+            if target_msg is not None:
+                frame_name = getattr(target_msg, "name", None)
+                signal_details = _resolve_signal_details(target_msg, decoded if isinstance(decoded, dict) else None)
+        return data_str, decoded, frame_name, signal_details
+
+    def msg_to_dict(msg, *, direction: str = "rx", ts: float | None = None) -> Dict[str, Any]:
+        data = getattr(msg, "data", None)
+        arbitration_id = msg.arbitration_id
+        try:
+            payload = bytes(data) if data is not None else b""
+        except Exception:
+            payload = b""
+        data_str, decoded, frame_name, signal_details = describe(arbitration_id, payload)
+        direction_label = "TX" if str(direction).lower() == "tx" else "RX"
+        is_fd = bool(getattr(msg, "is_fd", False))
+        return {
+            "ts": ts if ts is not None else time.time(),
+            "id": _hex_id(arbitration_id),
+            "dlc": len(data) if data is not None else 0,
+            "data": data_str,
+            "is_extended": bool(getattr(msg, "is_extended_id", False)),
+            "is_fd": is_fd,
+            "frame_type": "CAN FD" if is_fd else "CAN",
+            "direction": direction_label,
+            "frame_name": frame_name,
+            "decoded": decoded,
+            "signals": signal_details,
+        }
+
+    return msg_to_dict
+
+
+def _refresh_msg_to_dict() -> None:
+    """Rebuild the trace converter after the CAN interface or decode flag changes."""
+    state.msg_to_dict = _build_msg_to_dict(state.decode_enabled, state.canif)
 
 
-def _emit_trace_message(msg, *, direction: str = "rx") -> None:
+_refresh_msg_to_dict()
+
+
+def _msg_to_dict(msg, *, direction: str = "rx", ts: float | None = None) -> Dict[str, Any]:
+    return state.msg_to_dict(msg, direction=direction, ts=ts)
+
+
+# Memory cap on frames packed into one "trace_batch" event. Batches are
+# otherwise sized by whatever is queued when the worker wakes, so a quiet
+# bus emits single frames and a burst is sent in as few events as possible.
+TRACE_BATCH_MAX = 2048
+
+# TX frames waiting for the trace emitter. Bounded so a TX burst that outruns
+# the emitter drops trace entries instead of growing memory and lag; the
+# single consumer keeps TX frames in send order and takes the DBC decode and
+# the socket emit off the periodic scheduler thread.
+_TX_TRACE_QUEUE: "queue.Queue" = queue.Queue(maxsize=TRACE_BATCH_MAX)
+_tx_trace_lock = threading.Lock()
+_tx_trace_thread: threading.Thread | None = None
+
+
+def _queue_tx_trace(msg) -> None:
+    global _tx_trace_thread
     if not state.trace_running:
         return
     try:
-        socketio.emit("trace", _msg_to_dict(msg, direction=direction))
-    except Exception:
-        pass
+        _TX_TRACE_QUEUE.put_nowait(msg)
+    except queue.Full:
+        return
+    if _tx_trace_thread is None:
+        with _tx_trace_lock:
+            if _tx_trace_thread is None:
+                _tx_trace_thread = threading.Thread(
+                    target=_tx_trace_worker, name="tx-trace", daemon=True
+                )
+                _tx_trace_thread.start()
+
+
+def _tx_trace_worker() -> None:
+    get = _TX_TRACE_QUEUE.get
+    get_nowait = _TX_TRACE_QUEUE.get_nowait
+    while True:
+        items = [get()]
+        while len(items) < TRACE_BATCH_MAX:
+            try:
+                items.append(get_nowait())
+            except queue.Empty:
+                break
+        if not state.trace_running:
+            continue
+        now = time.time()
+        msg_to_dict = state.msg_to_dict
+        batch = []
+        append = batch.append
+        for msg in items:
+            try:
+                append(msg_to_dict(msg, direction="tx", ts=now))
+            except Exception:
+                continue
+        if not batch:
+            continue
+        try:
+            socketio.emit("trace_batch", batch)
+        except Exception:
+            pass
 
 
 def _trace_worker():
-    while state.trace_running and state.canif:
-        target_queue = getattr(state.canif, "ui_trace_queue", None)
+    emit = socketio.emit
+    sleep = socketio.sleep
+    while state.trace_running:
+        canif = state.canif
+        if not canif:
+            break
+        target_queue = getattr(canif, "ui_trace_queue", None)
         if target_queue is None:
-            socketio.sleep(0.05)
+            sleep(0.05)
             continue
         try:
-            msg, direction = target_queue.get(timeout=0.1)
+            items = [target_queue.get(timeout=0.1)]
+        except queue.Empty:
+            # get() already waited; nothing to add on an idle bus
+            continue
         except Exception:
-            socketio.sleep(0.01)
+            sleep(0.01)
+            continue
+        # Drain whatever else is already queued so a busy bus costs one
+        # emit per batch instead of one per frame.
+        get_nowait = target_queue.get_nowait
+        while len(items) < TRACE_BATCH_MAX:
+            try:
+                items.append(get_nowait())
+            except queue.Empty:
+                break
+        # One wall-clock read per drained batch
+        now = time.time()
+        msg_to_dict = state.msg_to_dict
+        batch = []
+        append = batch.append
+        for msg, direction in items:
+            try:
+                append(msg_to_dict(msg, direction=direction, ts=now))
+            except Exception:
+                continue
+        if not batch or not state.trace_running:
             continue
         try:
-            _emit_trace_message(msg, direction=direction)
+            emit("trace_batch", batch)
         except Exception:
             # Ignore emit failures to keep loop healthy
             pass
+        # Yield to other greenlets/threads without adding latency
+        sleep(0)
 
 
 @app.route("/")
@@ -538,8 +723,10 @@ def api_init():
         except Exception:
             pass
 
+    _clear_signal_caches()
     state.canif = CANInterface(device=device, is_fd=is_fd, channel=channel, padding=padding, dbc_path=dbc_path)
-    state.canif.set_tx_hook(lambda message: _emit_trace_message(message, direction="tx"))
+    _refresh_msg_to_dict()
+    state.canif.set_tx_hook(_queue_tx_trace)
     state.canif.initialize_bus()
     state.cantp = CANTP(CanIF=state.canif, padding=padding)
     state.diag = None
@@ -578,27 +765,41 @@ def api_shutdown():
     return jsonify({"ok": True, "connected": False, "dbc_loaded": dbc_loaded})
 
 
+def _compute_message_entry_prefix(m):
+    entry = {
+        "name": getattr(m, "name", ""),
+        "id": getattr(m, "frame_id", 0),
+        "id_hex": _hex_id(getattr(m, "frame_id", 0)),
+        "dlc": getattr(m, "length", 8),
+        "cycle_time": getattr(m, "cycle_time", None),
+        "is_extended": getattr(m, "is_extended_frame", False),
+        "senders": getattr(m, "senders", []),
+        "signals": [s.name for s in getattr(m, "signals", [])],
+    }
+    # Serialized without the closing brace so "running" can be appended
+    return json.dumps(_json_safe(entry))[:-1]
+
+
+def _message_entry_prefix(m):
+    """Static JSON of an /api/dbc/messages entry, built once per message."""
+    return _cached_by_identity(_MESSAGE_ENTRY_CACHE, m, _compute_message_entry_prefix)
+
+
 @app.route("/api/dbc/messages", methods=["GET"])
 def api_dbc_messages():
     if not state.canif or not state.canif.dbc:
         return jsonify({"ok": False, "error": "DBC not loaded"}), 400
-    out = []
+    messages = state.canif._Messages()
+    # Entries come from cached per-message JSON fragments; build them all
+    # before answering so a failure part-way through is still a 500.
     try:
-        for m in state.canif._Messages():
-            out.append({
-                "name": getattr(m, "name", ""),
-                "id": getattr(m, "frame_id", 0),
-                "id_hex": Hex(getattr(m, "frame_id", 0)),
-                "dlc": getattr(m, "length", 8),
-                "cycle_time": getattr(m, "cycle_time", None),
-                "is_extended": getattr(m, "is_extended_frame", False),
-                "senders": getattr(m, "senders", []),
-                "signals": [s.name for s in getattr(m, "signals", [])],
-                "running": _message_is_running(m),
-            })
+        entries = [
+            _message_entry_prefix(m) + (',"running":true}' if _message_is_running(m) else ',"running":false}')
+            for m in messages
+        ]
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
-    return jsonify({"ok": True, "messages": out})
+    return Response('{"ok":true,"messages":[' + ",".join(entries) + "]}", mimetype="application/json")
 
 
 @app.route("/api/messages/reset", methods=["POST"])
@@ -642,6 +843,37 @@ def api_dbc_message_current(msg_name: str):
     return jsonify({"ok": True, "signals": curr})
 
 
+def _compute_signal_static_info(sig):
+    bounds = _signal_bounds(sig)
+    physical_min, physical_max = _infer_physical_bounds(sig, bounds)
+    scale_attr = _signal_attr(sig, "scale")
+    return {
+        "name": _signal_attr(sig, "name"),
+        "start": _json_safe(_signal_attr(sig, "start")),
+        "length": _json_safe(_signal_attr(sig, "length")),
+        "scale": _json_safe(scale_attr),
+        "offset": _json_safe(_signal_attr(sig, "offset")),
+        "minimum": _json_safe(physical_min),
+        "maximum": _json_safe(physical_max),
+        "unit": _signal_attr(sig, "unit"),
+        "choices": normalize_choices(_signal_attr(sig, "choices") or {}),
+        "is_float": bool(_signal_attr(sig, "is_float", False) or isinstance(scale_attr, float)),
+        "bit_length": bounds["bit_length"],
+        "is_signed": bounds["is_signed"],
+        "raw_signed_min": _json_safe(bounds["raw_signed_min"]),
+        "raw_signed_max": _json_safe(bounds["raw_signed_max"]),
+        "raw_unsigned_min": _json_safe(bounds["raw_unsigned_min"]),
+        "raw_unsigned_max": _json_safe(bounds["raw_unsigned_max"]),
+        "raw_min": _json_safe(bounds["raw_unsigned_min"]),
+        "raw_max": _json_safe(bounds["raw_unsigned_max"]),
+    }
+
+
+def _signal_static_info(sig):
+    """DBC-derived part of a message_info signal entry; shared, do not mutate."""
+    return _cached_by_identity(_STATIC_INFO_CACHE, sig, _compute_signal_static_info)
+
+
 @app.route("/api/dbc/message_info/<string:msg_name>", methods=["GET"])
 def api_dbc_message_info(msg_name: str):
     if not state.canif or not state.canif.dbc:
@@ -653,40 +885,19 @@ def api_dbc_message_info(msg_name: str):
         return jsonify({"ok": False, "error": str(e)}), 400
 
     signals = []
+    has_current = isinstance(curr, dict)
     for sig in getattr(message, "signals", []):
-        sig_name = _signal_attr(sig, "name")
-        physical = curr.get(sig_name) if isinstance(curr, dict) and sig_name in curr else None
-        bounds = _signal_bounds(sig)
+        static = _signal_static_info(sig)
+        sig_name = static["name"]
+        bit_length = static["bit_length"]
+        physical = curr.get(sig_name) if has_current and sig_name in curr else None
         raw_signed = _physical_to_raw(sig, physical)
-        raw_unsigned = _signal_unsigned(raw_signed, bounds["bit_length"])
-        physical_min, physical_max = _infer_physical_bounds(sig, bounds)
-        scale_attr = _signal_attr(sig, "scale")
-        offset_attr = _signal_attr(sig, "offset")
-        choices = normalize_choices(_signal_attr(sig, "choices") or {})
-        signal_info = {
-            "name": sig_name,
-            "start": _json_safe(_signal_attr(sig, "start")),
-            "length": _json_safe(_signal_attr(sig, "length")),
-            "physical": _json_safe(physical),
-            "raw": _json_safe(raw_signed),
-            "raw_unsigned": _json_safe(raw_unsigned),
-            "raw_hex": _format_raw_hex(raw_unsigned, bounds["bit_length"]),
-            "scale": _json_safe(scale_attr),
-            "offset": _json_safe(offset_attr),
-            "minimum": _json_safe(physical_min),
-            "maximum": _json_safe(physical_max),
-            "unit": _signal_attr(sig, "unit"),
-            "choices": choices,
-            "is_float": bool(_signal_attr(sig, "is_float", False) or isinstance(scale_attr, float)),
-            "bit_length": bounds["bit_length"],
-            "is_signed": bounds["is_signed"],
-            "raw_signed_min": _json_safe(bounds["raw_signed_min"]),
-            "raw_signed_max": _json_safe(bounds["raw_signed_max"]),
-            "raw_unsigned_min": _json_safe(bounds["raw_unsigned_min"]),
-            "raw_unsigned_max": _json_safe(bounds["raw_unsigned_max"]),
-            "raw_min": _json_safe(bounds["raw_unsigned_min"]),
-            "raw_max": _json_safe(bounds["raw_unsigned_max"]),
-        }
+        raw_unsigned = _signal_unsigned(raw_signed, bit_length)
+        signal_info = dict(static)
+        signal_info["physical"] = _json_safe(physical)
+        signal_info["raw"] = _json_safe(raw_signed)
+        signal_info["raw_unsigned"] = _json_safe(raw_unsigned)
+        signal_info["raw_hex"] = _format_raw_hex(raw_unsigned, bit_length)
         signals.append(signal_info)
 
     message_name = _signal_attr(message, "name", msg_name)
@@ -765,7 +976,7 @@ def api_periodic_stop():
         # Work around CANInterface.stop_periodic issue by going direct
         try:
             # If a name is provided, resolve to frame_id
-            if isinstance(msg, str) and not msg.lower().startswith("0x") and not all(c in "0123456789abcdefABCDEF" for c in msg):
+            if isinstance(msg, str) and not msg.lower().startswith("0x") and not _HEX_RE.fullmatch(msg):
                 m = state.canif.get_msg_att(msg)
                 msg_id = m.frame_id
             else:
@@ -779,8 +990,17 @@ def api_periodic_stop():
         return jsonify({"ok": False, "error": str(e)}), 400
 
 
+def _sig_lookup(message):
+    """Signal name -> signal object for a DBC message, built once per message."""
+    return _cached_by_identity(
+        _SIGLOOKUP_CACHE,
+        message,
+        lambda msg: {sig.name: sig for sig in getattr(msg, "signals", [])},
+    )
+
+
 def _prepare_signal_updates(message, signal_payloads):
-    signal_lookup = {sig.name: sig for sig in getattr(message, "signals", [])}
+    signal_lookup = _sig_lookup(message)
     updates = {}
     applied = {}
 
@@ -913,7 +1133,7 @@ def api_stim_update():
 
     msg_id = getattr(message, "frame_id", None)
     scheduler = getattr(state.canif, "scheduler", None)
-    running = bool(getattr(scheduler, "tasks", {}).get(msg_id)) if scheduler and msg_id is not None else False
+    running = scheduler.is_running(msg_id) if scheduler and msg_id is not None else False
     started = False
 
     if not running:
@@ -921,11 +1141,11 @@ def api_stim_update():
             state.canif.start_periodic_by_message(msg_name)
             started = True
             scheduler = getattr(state.canif, "scheduler", None)
-            running = bool(getattr(scheduler, "tasks", {}).get(msg_id)) if scheduler and msg_id is not None else False
+            running = scheduler.is_running(msg_id) if scheduler and msg_id is not None else False
         except Exception as e:
             return jsonify({"ok": False, "error": f"Failed to start periodic: {e}"}), 400
 
-    if (not burst_triggered) and scheduler and msg_id is not None and getattr(scheduler, "tasks", {}).get(msg_id):
+    if (not burst_triggered) and running:
         try:
             scheduler.trigger_burst(msg_id)
             burst_triggered = True
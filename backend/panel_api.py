@@ -1,6 +1,8 @@
 import ast
 import json
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
 from flask import Blueprint, current_app, jsonify, request
@@ -14,8 +16,27 @@ IMAGE_FOLDERS = {
     'blue': Path('static/assets/blue'),
     'red': Path('static/assets/red'),
 }
+IMAGE_SUFFIXES = frozenset({'.png', '.jpg', '.jpeg', '.svg'})
+
+# Folder -> (directory mtime_ns, sorted file names); adding, removing or
+# renaming an image bumps the directory mtime and forces a rescan.
+_IMAGE_LIST_CACHE = {}
+
+# Layout file -> ((mtime_ns, size), serialized /load response body). /save
+# drops the entry; the stat key only catches edits made outside the app.
+_LAYOUT_CACHE = {}
+
+# Scripts re-send the same literals on every event; parse each text once.
+# Results are shared, so callers must not mutate them.
+_literal_eval = lru_cache(maxsize=512)(ast.literal_eval)
 
 BLOCK_PATTERN = re.compile(r'on\s+([a-zA-Z_][\w]*)\s*(?:([^\{]*))?\{([^}]*)\}', re.IGNORECASE | re.DOTALL)
+KEY_PATTERN = re.compile(r'([{,]\s*)([A-Za-z_][\w]*)\s*:')
+TRUE_PATTERN = re.compile(r'\btrue\b', re.IGNORECASE)
+FALSE_PATTERN = re.compile(r'\bfalse\b', re.IGNORECASE)
+NULL_PATTERN = re.compile(r'\bnull\b', re.IGNORECASE)
+CONDITION_PATTERN = re.compile(r'([A-Za-z_][\w]*)\s*(==|!=|>=|<=|>|<)\s*(.+)')
+LAMP_PATTERN = re.compile(r"lamp\s*\((['\"])(.+?)\1\)\s*\.\s*(on|off)\s*\(\s*\)", re.IGNORECASE)
 
 
 def _panel_data_path():
@@ -32,10 +53,10 @@ def _get_state():
 def _normalize_literal(text):
   if not isinstance(text, str):
     return text
-  sanitized = re.sub(r'([{,]\s*)([A-Za-z_][\w]*)\s*:', r"\1'\2':", text)
-  sanitized = re.sub(r'\btrue\b', 'True', sanitized, flags=re.IGNORECASE)
-  sanitized = re.sub(r'\bfalse\b', 'False', sanitized, flags=re.IGNORECASE)
-  sanitized = re.sub(r'\bnull\b', 'None', sanitized, flags=re.IGNORECASE)
+  sanitized = KEY_PATTERN.sub(r"\1'\2':", text)
+  sanitized = TRUE_PATTERN.sub('True', sanitized)
+  sanitized = FALSE_PATTERN.sub('False', sanitized)
+  sanitized = NULL_PATTERN.sub('None', sanitized)
   return sanitized
 
 
@@ -78,22 +99,32 @@ def _split_commands(body):
   return commands
 
 
+@lru_cache(maxsize=256)
+def _parse_condition(condition):
+  """Return (lower-cased signal, operator, threshold) for a block condition, or None."""
+  match = CONDITION_PATTERN.match(condition)
+  if not match:
+    return None
+  signal_name, operator, threshold = match.groups()
+  try:
+    rhs = _literal_eval(_normalize_literal(threshold.strip()))
+  except Exception:
+    rhs = threshold.strip()
+  return signal_name.strip().lower(), operator, rhs
+
+
 def _condition_matches(condition, state):
   if not condition:
     return True
   if not isinstance(state, dict):
     return False
-  match = re.match(r'([A-Za-z_][\w]*)\s*(==|!=|>=|<=|>|<)\s*(.+)', condition)
-  if not match:
+  parsed = _parse_condition(condition)
+  if parsed is None:
     return False
-  signal_name, operator, threshold = match.groups()
+  signal_key, operator, rhs = parsed
   incoming = state.get('signal')
-  if incoming and signal_name and incoming.strip().lower() != signal_name.strip().lower():
+  if incoming and incoming.strip().lower() != signal_key:
     return False
-  try:
-    rhs = ast.literal_eval(_normalize_literal(threshold.strip()))
-  except Exception:
-    rhs = threshold.strip()
   lhs = state.get('value', state.get('raw'))
   try:
     lhs_val = float(lhs)
@@ -119,19 +150,28 @@ def _condition_matches(condition, state):
   return False
 
 
+@lru_cache(maxsize=128)
+def _script_blocks(script):
+  """Split a panel script into (event, condition, commands) once per script text."""
+  blocks = []
+  for match in BLOCK_PATTERN.finditer(script):
+    event = (match.group(1) or '').strip().lower()
+    condition = (match.group(2) or '').strip()
+    body = match.group(3) or ''
+    blocks.append((event, condition, tuple(_split_commands(body))))
+  return tuple(blocks)
+
+
 def _parse_commands(script, event_name, state):
   actions = []
   if not script or not event_name:
     return actions
-  for match in BLOCK_PATTERN.finditer(script):
-    event = (match.group(1) or '').strip().lower()
-    condition = (match.group(2) or '').strip()
-    if event != event_name.lower():
+  event_name = event_name.lower()
+  for event, condition, commands in _script_blocks(script):
+    if event != event_name:
       continue
     if event == 'rx' and not _condition_matches(condition, state or {}):
       continue
-    body = match.group(3) or ''
-    commands = _split_commands(body)
     for command in commands:
       parsed = _command_to_action(command, state or {})
       if parsed:
@@ -157,7 +197,7 @@ def _command_to_action(command, state=None):
       if 'state.raw' in normalized:
         normalized = normalized.replace('state.raw', str(state.get('raw', state.get('value', 0))))
     try:
-      parsed = ast.literal_eval(f'({normalized})')
+      parsed = _literal_eval(f'({normalized})')
     except Exception:
       return None
     if not isinstance(parsed, tuple) or len(parsed) < 2:
@@ -172,7 +212,7 @@ def _command_to_action(command, state=None):
     if len(parsed) >= 3 and isinstance(signals, str):
       return {'type': 'send', 'message': message, 'signal': signals, 'value': parsed[2]}
     return None
-  lamp_match = re.match(r"lamp\s*\((['\"])(.+?)\1\)\s*\.\s*(on|off)\s*\(\s*\)", trimmed, re.IGNORECASE)
+  lamp_match = LAMP_PATTERN.match(trimmed)
   if lamp_match:
     target = lamp_match.group(2)
     state = lamp_match.group(3).lower()
@@ -191,6 +231,8 @@ def save_panel_layout():
   try:
     path = _panel_data_path()
     path.write_text(json.dumps(layout, indent=2))
+    # Same-size rewrites can keep the mtime on coarse-timestamp filesystems
+    _LAYOUT_CACHE.pop(path, None)
     return jsonify({'ok': True})
   except Exception as exc:
     return jsonify({'ok': False, 'error': str(exc)}), 500
@@ -199,13 +241,20 @@ def save_panel_layout():
 @panel_bp.route('/load', methods=['GET'])
 def load_panel_layout():
   path = _panel_data_path()
-  if not path.exists():
-    return jsonify({'ok': True, 'layout': None})
   try:
-    data = json.loads(path.read_text())
-  except Exception as exc:
-    return jsonify({'ok': False, 'error': str(exc)}), 500
-  return jsonify({'ok': True, 'layout': data})
+    st = path.stat()
+  except OSError:
+    return jsonify({'ok': True, 'layout': None})
+  key = (st.st_mtime_ns, st.st_size)
+  cached = _LAYOUT_CACHE.get(path)
+  if cached is None or cached[0] != key:
+    try:
+      data = json.loads(path.read_text())
+    except Exception as exc:
+      return jsonify({'ok': False, 'error': str(exc)}), 500
+    cached = (key, jsonify({'ok': True, 'layout': data}).get_data())
+    _LAYOUT_CACHE[path] = cached
+  return current_app.response_class(cached[1], mimetype='application/json')
 
 
 @panel_bp.route('/send-signal', methods=['POST'])
@@ -261,14 +310,24 @@ def panel_list_images():
   for color, rel_path in IMAGE_FOLDERS.items():
     try:
       target_dir = root / rel_path
-      if not target_dir.exists() or not target_dir.is_dir():
+      try:
+        mtime = target_dir.stat().st_mtime_ns
+      except OSError:
+        continue
+      if not target_dir.is_dir():
+        continue
+      cached = _IMAGE_LIST_CACHE.get(target_dir)
+      if cached is not None and cached[0] == mtime:
+        result[color] = list(cached[1])
         continue
-      entries = [
-        entry.name
-        for entry in target_dir.iterdir()
-        if entry.is_file() and entry.suffix.lower() in {'.png', '.jpg', '.jpeg', '.svg'}
-      ]
-      result[color] = sorted(entries)
+      with os.scandir(target_dir) as it:
+        entries = sorted(
+          entry.name
+          for entry in it
+          if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_SUFFIXES
+        )
+      _IMAGE_LIST_CACHE[target_dir] = (mtime, entries)
+      result[color] = list(entries)
     except Exception:
       result[color] = []
   return jsonify(result)
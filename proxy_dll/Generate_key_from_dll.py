@@ -1,7 +1,11 @@
 # r"""test.dll"""
  
+import atexit
 import ctypes
+import queue
 import subprocess
+import sys
+import threading
 import time
 import os
 from logger.log import logger
@@ -17,6 +21,142 @@ from logger.log import logger
 # ]
 # proxy_dll.Call32BitASKKeyGenerate.restype = ctypes.c_int  # Return an integer (Success/Failure)
  
+# Long-lived "GenerateKey.exe --serve" helper (PROXY_Generated/Helper32.cpp):
+# one "dll_path<TAB>seed_hex" line in, one key line out. Older helpers without
+# serve mode fall back to one process per seed.
+_HELPER_READY = "READY"
+# A helper that does not answer within this time is killed and restarted on
+# the next request, so one hung helper cannot block every caller.
+_HELPER_TIMEOUT_S = 5.0
+# After a start that failed without the helper rejecting --serve (slow READY,
+# e.g. an antivirus scan of the fresh process, or a spawn error), wait this
+# long before trying again instead of giving up for good.
+_HELPER_RETRY_S = 30.0
+_helper_lock = threading.Lock()
+_helper = None
+_helper_lines = None
+_helper_unsupported = False
+_helper_retry_at = 0.0
+_helper_fallback_logged = False
+ 
+def _helper_path():
+    return os.getcwd() + r'\GenerateKey.exe'
+ 
+def _pump_lines(stream, lines):
+    # Pipes cannot be polled with a timeout on Windows, so a reader thread
+    # hands stdout lines over a queue; "" marks EOF.
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    lines.put("")
+ 
+def _next_line(lines):
+    """Next stdout line, "" at EOF, None on timeout."""
+    try:
+        return lines.get(timeout=_HELPER_TIMEOUT_S)
+    except queue.Empty:
+        return None
+ 
+def _start_helper(helper_path):
+    """Return (proc, lines, reason); proc is None if the helper is not usable
+    now, and reason is then "rejected" only if it exited without READY."""
+    try:
+        proc = subprocess.Popen(
+            [helper_path, "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+    except OSError as e:
+        return None, None, f"could not start it: {e}"
+    lines = queue.SimpleQueue()
+    threading.Thread(target=_pump_lines, args=(proc.stdout, lines), daemon=True).start()
+    ready = _next_line(lines)
+    if ready is not None and ready.strip() == _HELPER_READY:
+        return proc, lines, None
+    # EOF or any other first line means this helper has no serve mode
+    rejected = ready is not None or proc.poll() is not None
+    try:
+        proc.kill()
+    except OSError:
+        pass
+    if rejected:
+        return None, None, "rejected"
+    return None, None, f"no {_HELPER_READY} within {_HELPER_TIMEOUT_S:g} s"
+ 
+def _stop_helper():
+    global _helper, _helper_lines
+    if _helper is not None:
+        try:
+            _helper.kill()
+        except OSError:
+            pass
+        _helper = None
+        _helper_lines = None
+ 
+def _request_key(dll_path, seed_hex):
+    """Ask the persistent helper for a key; None means use the one-shot path."""
+    global _helper, _helper_lines, _helper_unsupported, _helper_retry_at, _helper_fallback_logged
+    with _helper_lock:
+        if _helper_unsupported:
+            return None
+        if _helper is None or _helper.poll() is not None:
+            if time.monotonic() < _helper_retry_at:
+                return None
+            _helper, _helper_lines, reason = _start_helper(_helper_path())
+            if _helper is None:
+                if reason == "rejected":
+                    _helper_unsupported = True
+                    reason = "it does not support --serve"
+                else:
+                    _helper_retry_at = time.monotonic() + _HELPER_RETRY_S
+                if not _helper_fallback_logged:
+                    _helper_fallback_logged = True
+                    logger.warning(f"GenerateKey helper unavailable ({reason}); using one process per key")
+                return None
+        try:
+            _helper.stdin.write(f"{dll_path}\t{seed_hex}\n")
+            _helper.stdin.flush()
+        except (OSError, ValueError):
+            _stop_helper()
+            return None
+        reply = _next_line(_helper_lines)
+        if not reply:
+            logger.error("GenerateKey helper did not answer; restarting it")
+            _stop_helper()
+            return None
+    return reply.strip()
+ 
+atexit.register(_stop_helper)
+ 
+# A DLL built for this interpreter's bitness is called in-process; a 32-bit
+# one raises OSError on load and is left to the helper. Cached per path,
+# None meaning "not loadable here".
+_inproc_keygen = {}
+_SEED_ARRAY = ctypes.c_ubyte * 8
+# ASK_KeyGenerate is __stdcall (see Helper32.cpp); only WinDLL uses that
+# convention, and on 32-bit Python a cdecl call would corrupt the stack.
+_DLL_LOADER = ctypes.WinDLL if sys.platform == "win32" else ctypes.CDLL
+ 
+def _load_inproc_keygen(dll_path):
+    try:
+        return _inproc_keygen[dll_path]
+    except KeyError:
+        pass
+    keygen = None
+    try:
+        keygen = _DLL_LOADER(dll_path).ASK_KeyGenerate
+        keygen.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
+        keygen.restype = None
+    except (OSError, AttributeError):
+        keygen = None
+    _inproc_keygen[dll_path] = keygen
+    return keygen
+ 
 def ASK_KeyGenerate(dll_path, seed):
     """ Generate key from given seed """
     result = None
@@ -24,11 +164,28 @@ def ASK_KeyGenerate(dll_path, seed):
     # Convert seed to hex string
     seed_hex = f"{seed:016X}"
     # print("Generating key")
-    cwd = os.getcwd()
-    helper_path = cwd + r'\GenerateKey.exe'
+    keygen = _load_inproc_keygen(dll_path)
+    if keygen is not None:
+        seed_array = _SEED_ARRAY.from_buffer_copy(bytes.fromhex(seed_hex))
+        key_buffer = _SEED_ARRAY()
+        keygen(seed_array, key_buffer)
+        return bytes(key_buffer).hex().upper()
+ 
+    computed_key = _request_key(dll_path, seed_hex)
+    if computed_key is not None:
+        if computed_key.startswith("ERR"):
+            logger.error(f"Error calling Helper32.exe: {computed_key[3:].strip()}")
+            return None
+        return computed_key
  
     # Call Helper32.exe
-    result = subprocess.run([helper_path, dll_path, seed_hex], capture_output=True, text=True)
+    try:
+        result = subprocess.run(
+            [_helper_path(), dll_path, seed_hex], capture_output=True, text=True, timeout=_HELPER_TIMEOUT_S
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.error(f"Error calling Helper32.exe: {e}")
+        return None
  
     if result.returncode != 0:
         logger.error(f"Error calling Helper32.exe: {result.stderr}")
@@ -1,7 +1,7 @@
 import ctypes
 import sys
-import pefile
 import time
+from functools import lru_cache
 from logger.log import logger
 """
 ASK_KeyGenerate
@@ -10,41 +10,54 @@ seed2key
 vGetVersionInfo
 """
  
-start = time.time()
 # Load 32-bit DLL
 dll_path = r"D:\00_Src\AUTOSAR_BJ_EV\CryptoLib\ASK\20_lib_Win32_client\HKMC_AdvancedSeedKey_Win32.dll"
 # dll_path = r"a.dll"
-security_dll = ctypes.WinDLL(dll_path)  # Use WinDLL or CDLL depending on the DLL type
-pe = pefile.PE(dll_path)
  
-logger.info("Exported Functions:")
-for exp in pe.DIRECTORY_ENTRY_EXPORT.symbols:
-    logger.info(exp.name.decode() if exp.name else f"Ordinal {exp.ordinal}")
+ 
+@lru_cache(maxsize=None)
+def _load_dll(path):
+    security_dll = ctypes.WinDLL(path)  # Use WinDLL or CDLL depending on the DLL type
+ 
+    # Modify the function prototype to accept an output buffer
+    security_dll.vGetVersionInfo.argtypes = [ctypes.POINTER(ctypes.c_char)]
+    security_dll.vGetVersionInfo.restype = None  # Function modifies buffer, so no return value
+ 
+    # Assume seed2key takes a byte array and returns a byte array
+    security_dll.seed2key.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
+    security_dll.seed2key.restype = None  # If it modifies an output buffer
+ 
+    # Assume seed2key takes a byte array and returns a byte array
+    security_dll.ASK_KeyGenerate.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
+    security_dll.ASK_KeyGenerate.restype = None  # If it modifies an output buffer
+ 
+    security_dll.GenerateKeyEx.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
+    security_dll.GenerateKeyEx.restype = None  # If it modifies an output buffer
+    return security_dll
+ 
+ 
+def dump_exports(path):
+    import pefile
+    pe = pefile.PE(path)
+    logger.info("Exported Functions:")
+    for exp in pe.DIRECTORY_ENTRY_EXPORT.symbols:
+        logger.info(exp.name.decode() if exp.name else f"Ordinal {exp.ordinal}")
+ 
+ 
+start = time.time()
+security_dll = _load_dll(dll_path)
+if "--debug" in sys.argv:
+    dump_exports(dll_path)
  
 # Allocate a buffer (assuming version info is max 256 bytes)
 version_buffer = ctypes.create_string_buffer(256)
  
-# Modify the function prototype to accept an output buffer
-security_dll.vGetVersionInfo.argtypes = [ctypes.POINTER(ctypes.c_char)]
-security_dll.vGetVersionInfo.restype = None  # Function modifies buffer, so no return value
- 
 # Call the function
 security_dll.vGetVersionInfo(version_buffer)
  
 # Convert buffer to string
 logger.info(f"DLL Version: {version_buffer.value.decode('utf-8')}")
  
-# Assume seed2key takes a byte array and returns a byte array
-security_dll.seed2key.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
-security_dll.seed2key.restype = None  # If it modifies an output buffer
- 
-# Assume seed2key takes a byte array and returns a byte array
-security_dll.ASK_KeyGenerate.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
-security_dll.ASK_KeyGenerate.restype = None  # If it modifies an output buffer
- 
-security_dll.GenerateKeyEx.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
-security_dll.GenerateKeyEx.restype = None  # If it modifies an output buffer
- 
 # Prepare seed input (2-byte seed)
 seed = (0x75, 0x0d,0x4c,0x77,0x99,0xb5,0x85,0xa6)
 seed1 = (0x750d4c7799b585a6)
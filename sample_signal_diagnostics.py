@@ -100,13 +100,14 @@ def detect_message_json_issue(payload: Dict[str, Any]) -> str | None:
 
 def normalize_signal(signal) -> Dict[str, Any]:
     """Simulate EXACT CanX backend JSON that the UI expects."""
+    scale = getattr(signal, "scale", None)
     return {
         "name": signal.name,
         "start": getattr(signal, "start", None),
         "length": getattr(signal, "length", None),
-        "scale": getattr(signal, "scale", None),
+        "scale": scale,
         "offset": getattr(signal, "offset", None),
-        "is_float": isinstance(getattr(signal, "scale", None), float),
+        "is_float": isinstance(scale, float),
         "unit": getattr(signal, "unit", None),
         "choices": getattr(signal, "choices", {}) or {},
     }
@@ -134,66 +135,69 @@ def analyze_message(adapter, msg) -> Dict[str, Any]:
         result["errors"].append("Message has NO signals.")
         return result
 
+    # Simulate EXACT backend JSON packing. Encoding the whole payload once
+    # settles the common case; the per-field checks below only run to
+    # pinpoint the culprit when it fails.
+    normalized_signals = [normalize_signal(s) for s in msg.signals]
+    backend_payload = {
+        "frame_id": msg.frame_id,
+        "signals": normalized_signals,
+    }
+    payload_ok = safe_json(backend_payload) == "OK"
+
     # Duplicate signal names
-    names = [s.name for s in msg.signals]
+    names = [ns["name"] for ns in normalized_signals]
     if len(names) != len(set(names)):
         result["errors"].append("Duplicate signal names detected.")
 
-    normalized_signals = []
-
     # Check each signal
-    for s in msg.signals:
-        sig_info = {"name": s.name, "errors": [], "warnings": []}
+    for backend_obj in normalized_signals:
+        name = backend_obj["name"]
+        sig_info = {"name": name, "errors": [], "warnings": []}
 
         # Check start/length
-        if getattr(s, "start", None) is None:
+        if backend_obj["start"] is None:
             sig_info["errors"].append("Missing 'start' attribute")
-        if getattr(s, "length", None) is None:
+        if backend_obj["length"] is None:
             sig_info["errors"].append("Missing 'length' attribute")
 
         # scale/offset validity
-        scale = getattr(s, "scale", None)
-        offset = getattr(s, "offset", None)
+        scale = backend_obj["scale"]
+        offset = backend_obj["offset"]
 
         if isinstance(scale, float) and math.isnan(scale):
             sig_info["errors"].append("scale = NaN")
         if isinstance(offset, float) and math.isnan(offset):
             sig_info["errors"].append("offset = NaN")
 
-        # unit issues (unicode, strange chars)
-        unit = getattr(s, "unit", "")
-        if isinstance(unit, str):
-            try:
-                json.dumps({"u": unit})
-            except Exception as e:
-                sig_info["errors"].append(f"unit JSON error: {e}")
-
-        # choices must be JSON-serializable
-        choices = getattr(s, "choices", {}) or {}
-        bad_choices = detect_non_serializable_dict(choices)
-        if bad_choices:
-            sig_info["errors"].append("Invalid choices: " + ", ".join(bad_choices))
-
-        # Simulate EXACT backend JSON packing
-        backend_obj = normalize_signal(s)
-        js_status = safe_json(backend_obj)
-        if js_status != "OK":
-            sig_info["errors"].append(f"Backend JSON error: {js_status}")
+        if not payload_ok:
+            # unit issues (unicode, strange chars)
+            unit = backend_obj["unit"]
+            if isinstance(unit, str):
+                try:
+                    json.dumps({"u": unit})
+                except Exception as e:
+                    sig_info["errors"].append(f"unit JSON error: {e}")
+
+            # choices must be JSON-serializable
+            bad_choices = detect_non_serializable_dict(backend_obj["choices"])
+            if bad_choices:
+                sig_info["errors"].append("Invalid choices: " + ", ".join(bad_choices))
+
+            js_status = safe_json(backend_obj)
+            if js_status != "OK":
+                sig_info["errors"].append(f"Backend JSON error: {js_status}")
 
         if sig_info["errors"]:
-            result["errors"].append(f"Signal '{s.name}' failed checks: {sig_info['errors']}")
+            result["errors"].append(f"Signal '{name}' failed checks: {sig_info['errors']}")
 
         result["signals"].append(sig_info)
-        normalized_signals.append(normalize_signal(s))
 
     # Additional backend JSON payload verification
-    backend_payload = {
-        "frame_id": msg.frame_id,
-        "signals": normalized_signals,
-    }
-    json_issue = detect_message_json_issue(backend_payload)
-    if json_issue:
-        result["errors"].append(json_issue)
+    if not payload_ok:
+        json_issue = detect_message_json_issue(backend_payload)
+        if json_issue:
+            result["errors"].append(json_issue)
 
     return result
 
@@ -212,6 +212,9 @@ export function initLog({ socket, getActiveTab, onTabChange }) {
   });
 
   socket.on('trace', recordMessage);
+  socket.on('trace_batch', (batch) => {
+    if (Array.isArray(batch)) batch.forEach((msg) => recordMessage(msg));
+  });
 
   socket.on('trace_info', (msg) => {
     if (msg && Object.prototype.hasOwnProperty.call(msg, 'running')) {
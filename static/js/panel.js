@@ -558,6 +558,9 @@ const initPanel = () => {
     const socket = await waitForSocket();
     if (!socket || typeof socket.on !== 'function') return;
     socket.on('trace', handleTrace);
+    socket.on('trace_batch', (batch) => {
+      if (Array.isArray(batch)) batch.forEach((msg) => handleTrace(msg));
+    });
   };
 
   window.addEventListener('keydown', (e) => {
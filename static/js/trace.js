@@ -348,6 +348,9 @@ export function initTrace({ socket, getActiveTab, onTabChange }) {
   });
 
   socket.on('trace', handleTraceMessage);
+  socket.on('trace_batch', (batch) => {
+    if (Array.isArray(batch)) batch.forEach((msg) => handleTraceMessage(msg));
+  });
 
   socket.on('trace_info', (msg) => {
     if (msg && Object.prototype.hasOwnProperty.call(msg, 'running')) {
@@ -0,0 +1,115 @@
+"""Regression tests for CANTP.session."""
+import threading
+import types
+import unittest
+
+from CANTP.session import CANTPSession, CANTPSessionManager, FlowControlSettings
+
+
+class _LoopbackCan:
+    """Minimal CAN interface: answers our Flow Control with queued CFs."""
+
+    def __init__(self, first_frame, consecutive_frames):
+        self._first_frame = first_frame
+        self._consecutive_frames = consecutive_frames
+        self._callback = None
+
+    def subscribe_id_queue(self, can_id, callback):
+        self._callback = callback
+
+    def unsubscribe_id_queue(self, can_id):
+        self._callback = None
+
+    def deliver(self, data):
+        self._callback(types.SimpleNamespace(data=bytes(data)))
+
+    def start(self):
+        # FF arrives once receive() is already waiting for it
+        threading.Timer(0.05, self.deliver, args=(self._first_frame,)).start()
+
+    def write(self, can_id, payload, padding=None):
+        for frame in self._consecutive_frames:
+            self.deliver(frame)
+        return True
+
+
+def _segment(payload):
+    """Split ``payload`` into a classic CAN First Frame and its CFs."""
+    length = len(payload)
+    first = bytes([0x10 | (length >> 8), length & 0xFF]) + payload[:6]
+    frames = []
+    sn = 1
+    for offset in range(6, length, 7):
+        chunk = payload[offset:offset + 7]
+        frames.append(bytes([0x20 | sn]) + chunk + b"\x00" * (7 - len(chunk)))
+        sn = (sn + 1) & 0x0F
+    return first, frames
+
+
+class FirstFrameLengthTest(unittest.TestCase):
+    def test_12bit_lengths(self):
+        for length in (20, 255, 256, 0x200, 511, 0xFFF):
+            frame = bytes([0x10 | (length >> 8), length & 0xFF, 1, 2, 3, 4, 5, 6])
+            self.assertEqual(CANTPSession._first_frame_length(frame), (length, 2))
+
+    def test_escape_length(self):
+        frame = bytes([0x10, 0x00, 0x00, 0x00, 0x10, 0x00, 1, 2])
+        self.assertEqual(CANTPSession._first_frame_length(frame), (0x1000, 6))
+
+
+class ReceiveTest(unittest.TestCase):
+    def _receive(self, length):
+        payload = bytes(i & 0xFF for i in range(length))
+        canif = _LoopbackCan(*_segment(payload))
+        session = CANTPSession(
+            canif,
+            "7E0",
+            "7E8",
+            chunk_length=8,
+            padding="00",
+            rx_flow_control=FlowControlSettings(),
+        )
+        session.open()
+        canif.start()
+        try:
+            return session.receive(timeout_ms=500), payload
+        finally:
+            session.close()
+
+    def test_receive_ff_dl_256(self):
+        received, payload = self._receive(256)
+        self.assertEqual(received, [f"{b:02X}" for b in payload])
+
+    def test_receive_ff_dl_20(self):
+        received, payload = self._receive(20)
+        self.assertEqual(received, [f"{b:02X}" for b in payload])
+
+
+class SessionManagerTest(unittest.TestCase):
+    def test_session_is_subscribed_before_it_is_returned(self):
+        canif = _LoopbackCan(b"", [])
+        manager = CANTPSessionManager(
+            canif,
+            chunk_length=8,
+            padding="00",
+            default_rx_flow_control=FlowControlSettings(),
+        )
+        sessions = []
+        subscribed = []
+
+        def lookup():
+            session = manager.get_session("7e0", "7e8")
+            subscribed.append(canif._callback is not None)
+            sessions.append(session)
+
+        workers = [threading.Thread(target=lookup) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertTrue(all(subscribed))
+        self.assertEqual(len({id(session) for session in sessions}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for the ComDiag background TX worker."""
+import threading
+import unittest
+
+from COMDIAG.ComDia import ComDiag
+
+
+class _BlockingCan:
+    """CAN interface whose first write blocks until released."""
+
+    padding = "00"
+    is_fd = False
+
+    def __init__(self):
+        self.frames = []
+        self.release = threading.Event()
+        self.first_write = threading.Event()
+
+    def subscribe_id_queue(self, can_id, callback):
+        pass
+
+    def unsubscribe_id_queue(self, can_id):
+        pass
+
+    def write(self, can_id, frame, padding=None):
+        self.frames.append(frame)
+        if not self.first_write.is_set():
+            self.first_write.set()
+            self.release.wait(2)
+        return True
+
+
+class TxWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.canif = _BlockingCan()
+        self.diag = ComDiag(self.canif, "7E0", "7E8")
+
+    def tearDown(self):
+        self.canif.release.set()
+        self.diag.shutdown()
+
+    def _wait_idle(self):
+        self.diag._tx_queue.put(None)
+        self.diag._tx_thread.join(2)
+
+    def test_duplicate_tester_present_is_coalesced(self):
+        self.diag.send_async("10 03")
+        self.assertTrue(self.canif.first_write.wait(2))
+        for _ in range(5):
+            self.diag.send_async("3E 80")
+        self.canif.release.set()
+        self._wait_idle()
+        self.assertEqual(len(self.canif.frames), 2)
+
+    def test_stop_tester_present_drops_queued_frames(self):
+        self.diag.send_async("10 03")
+        self.assertTrue(self.canif.first_write.wait(2))
+        self.diag.start_tester_present(interval=10000)
+        for _ in range(200):
+            if self.diag._tx_queue.qsize():
+                break
+            threading.Event().wait(0.01)
+        self.diag.stop_tester_present()
+        self.canif.release.set()
+        self._wait_idle()
+        self.assertEqual(len(self.canif.frames), 1)
+
+    def test_shutdown_stops_worker(self):
+        self.canif.release.set()
+        self.diag.send_async("3E 80")
+        thread = self.diag._tx_thread
+        self.diag.shutdown()
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,47 +1,57 @@
-import os
 from Find_lines_with_SubStrings import*
+from Find_lines_with_SubStrings import _ENCODING, _read_lines
 import cantools
  
 OUTPUT_PATH = "output"
  
 def Remove_duplicates(arr):
-    seen = set()
-    result = []
+    # First row per key wins; dicts keep insertion order
+    result = {}
     for sub_arr in arr:
-        first_sub = sub_arr[0]
-        if first_sub not in seen:
-            seen.add(first_sub)
-            result.append(sub_arr)
-    return result
+        result.setdefault(sub_arr[0], sub_arr)
+    return list(result.values())
  
-def Get_signals_TimeoutTime(dbc_path):
-    substrings = ['GenSigTimeoutTime','BA_REL_']
-    data = find_lines_with_substrings(dbc_path,substrings)
+# Lines stay raw bytes until they match, so only the kept ones are decoded.
+# Pass the same line list to every getter to read the DBC once.
+def Read_dbc_lines(dbc_path):
+    return list(_read_lines(dbc_path))
+ 
+def Get_signals_TimeoutTime(dbc_path, lines = None):
+    if lines is None:
+        lines = _read_lines(dbc_path)
     extracted_data = {}
-    for idx in range(len(data)):
-        extracted_data[data[idx][-2]] = str(data[idx][-1].replace(';',''))
+    for line in lines:
+        if b'GenSigTimeoutTime' not in line or b'BA_REL_' not in line:
+            continue
+        fields = line.decode(_ENCODING,errors="ignore").strip().split(" ")
+        extracted_data[fields[-2]] = fields[-1].replace(';','')
     return(extracted_data)
  
-def Get_signals_sign(dbc_path):
-    data = find_lines_begin_with_substring(dbc_path," SG_ ")
+def Get_signals_sign(dbc_path, lines = None):
+    if lines is None:
+        lines = _read_lines(dbc_path)
     extracted_data = {}
-    for idx in range(len(data)):
-        extracted_data[data[idx][1]] = data[idx][3].split("@")[-1]
+    for line in lines:
+        if not line.startswith(b' SG_ '):
+            continue
+        fields = line.decode(_ENCODING).strip().split(" ")
+        extracted_data[fields[1]] = fields[3].split("@")[-1]
     return extracted_data
  
-def Get_messages_nodes(dbc_path, nodes = ['']):
-    substrings = 'BO_'
-    data = find_lines_begin_with_substring(dbc_path,substrings)
+def Get_messages_nodes(dbc_path, nodes = [''], lines = None):
+    if lines is None:
+        lines = _read_lines(dbc_path)
     extracted_data = []
-    for idx in range(len(data)):
-        temp = []
-        temp.append(data[idx][2])
-        temp.append(data[idx][-1])
+    for line in lines:
+        if not line.startswith(b'BO_'):
+            continue
+        fields = line.decode(_ENCODING).strip().split(" ")
+        temp = [fields[2], fields[-1]]
         if (nodes[0] == ''):
             extracted_data.append(temp)
         else:
             for node in nodes:
-                if (node == data[idx][-1]):
+                if (node == fields[-1]):
                     extracted_data.append(temp)
     result = Remove_duplicates(extracted_data)
     return(result)
@@ -71,8 +81,9 @@ def Get_dbc_info(dbc_path):
     dbc_file_path = (f'{dbc_path}.dbc')
     dbc = cantools.database.load_file(dbc_file_path)
     messages = sorted(dbc_content.messages,key=lambda msg:msg.name)
-    timeout_list = Get_signals_TimeoutTime(dbc_file_path)
-    sign_list = Get_signals_sign(dbc_file_path)
+    dbc_lines = Read_dbc_lines(dbc_file_path)
+    timeout_list = Get_signals_TimeoutTime(dbc_file_path, dbc_lines)
+    sign_list = Get_signals_sign(dbc_file_path, dbc_lines)
  
     # Extract DBC data
     dbc_messages = {}
@@ -1,59 +1,122 @@
 r"""
 & C:\Users\vinhnt63\AppData\Local\Programs\Python\Python312-32\python.exe d:/COMMON/USERS/NhatPM7/Tool/CAN/GenerateKey.py
+ 
+Python counterpart of PROXY_Generated/Helper32.cpp, with the same command line
+and protocol as proxy_dll/Generate_key_from_dll.py expects:
+ 
+One-shot:  GenerateKey.exe <dll_path> <seed_hex>
+           prints the key as plain hex on stdout.
+Serve:     GenerateKey.exe --serve
+           prints READY, then answers every "dll_path<TAB>seed_hex" line on
+           stdin with the key as plain hex (or "ERR <reason>") on stdout.
 """
  
  
 import ctypes
 import sys
 import os
-from logger.log import logger
- 
- 
-# Check if correct arguments are passed
-if len(sys.argv) != 3:
-    logger.error("Usage: call_32bit.exe <seed> <dll_path>")
-    sys.exit(1)
- 
-# Read command-line arguments
-seed = sys.argv[1]  # seed string
-dll_path = sys.argv[2]  # DLL path
- 
-# Ensure DLL exists
-if not os.path.exists(dll_path):
-    logger.error(f"Error: DLL not found at {dll_path}")
-    sys.exit(1)
- 
-# Load the DLL
-security_dll = ctypes.CDLL(dll_path)
- 
-# Convert order==========
- 
-seed_len = int(len(seed)/2)
-if (len(seed) % 2) != 0:
-    seed_len = int((len(seed)+1)/2)
- 
-seed_int = int(seed,16)
-seed_bytes = seed_int.to_bytes(seed_len, byteorder='big')  # Converts to 8-byte array
- 
- 
-# Create a ctypes c_ubyte array (8 bytes)
-seed_array = (ctypes.c_ubyte * seed_len)(*seed_bytes)
-key_buffer = (ctypes.c_ubyte * seed_len)()
- 
-# Create an LP_c_ubyte pointer (Pointer to seed_array)
-LP_c_ubyte = ctypes.POINTER(ctypes.c_ubyte)  # Define pointer type
-seed_buffer = ctypes.cast(seed_array, LP_c_ubyte)
-#========================
- 
- 
-# Define function prototype
-security_dll.ASK_KeyGenerate.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
-security_dll.ASK_KeyGenerate.restype = None  # If it modifies an output buffer
  
-# Call the function
-security_dll.ASK_KeyGenerate(seed_buffer, key_buffer)
-computed_key = " ".join(f"{b:02X}" for b in key_buffer)
  
-# Print the key (so Python 64-bit can read it)
-logger.info(f"key:{computed_key}")
- 
\ No newline at end of file
+# ASK_KeyGenerate is __stdcall, which only WinDLL calls correctly on 32-bit
+_DLL_LOADER = ctypes.WinDLL if sys.platform == "win32" else ctypes.CDLL
+ 
+# ASK_KeyGenerate per DLL path, prototypes already configured
+_keygen_cache = {}
+# c_ubyte array type per seed length (2, 4 or 8 bytes in practice)
+_arr_cache = {}
+ 
+def _arr(n):
+    t = _arr_cache.get(n)
+    if t is None:
+        t = _arr_cache[n] = ctypes.c_ubyte * n
+    return t
+ 
+# Reused seed/key buffers; the serve loop handles one request at a time and
+# CAN seeds are a few bytes, so steady state allocates no ctypes arrays.
+_SCRATCH_LEN = 32
+_scratch_seed = _arr(_SCRATCH_LEN)()
+_scratch_key = _arr(_SCRATCH_LEN)()
+ 
+def _load_keygen(dll_path):
+    keygen = _keygen_cache.get(dll_path)
+    if keygen is None:
+        # Load the DLL; a missing or unloadable file raises OSError here
+        security_dll = _DLL_LOADER(os.path.abspath(dll_path))
+ 
+        # Define function prototype
+        keygen = security_dll.ASK_KeyGenerate
+        keygen.argtypes = [ctypes.POINTER(ctypes.c_ubyte), ctypes.POINTER(ctypes.c_ubyte)]
+        keygen.restype = None  # If it modifies an output buffer
+        _keygen_cache[dll_path] = keygen
+    return keygen
+ 
+def generate_key(dll_path, seed):
+    keygen = _load_keygen(dll_path)
+ 
+    # Convert order==========
+ 
+    # Big-endian bytes straight from the hex text; odd lengths get a leading 0
+    seed_bytes = bytes.fromhex(seed if (len(seed) & 1) == 0 else '0' + seed)
+    seed_len = len(seed_bytes)
+    if not seed_len:
+        raise ValueError("empty seed")
+ 
+ 
+    # Create the c_ubyte arrays; ctypes passes them as POINTER(c_ubyte)
+    if seed_len <= _SCRATCH_LEN:
+        ctypes.memmove(_scratch_seed, seed_bytes, seed_len)
+        ctypes.memset(_scratch_key, 0, seed_len)
+        keygen(_scratch_seed, _scratch_key)
+        return ctypes.string_at(_scratch_key, seed_len)
+    ArrTy = _arr(seed_len)
+    seed_array = ArrTy.from_buffer_copy(seed_bytes)
+    key_buffer = ArrTy()
+    #========================
+ 
+    # Call the function
+    keygen(seed_array, key_buffer)
+    return bytes(key_buffer)
+ 
+def serve():
+    out = sys.stdout
+    out.write("READY\n")
+    out.flush()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            dll_path, seed = line.split("\t", 1)
+            reply = generate_key(dll_path, seed.strip()).hex().upper()
+        except Exception as e:
+            reply = f"ERR {e}"
+        out.write(reply + "\n")
+        out.flush()
+ 
+def main():
+    if len(sys.argv) == 2 and sys.argv[1] == "--serve":
+        serve()
+        return
+ 
+    # Check if correct arguments are passed
+    if len(sys.argv) != 3:
+        print("Usage: GenerateKey.exe <dll_path> <seed_hex> | GenerateKey.exe --serve", file=sys.stderr)
+        sys.exit(1)
+ 
+    # Read command-line arguments
+    dll_path = sys.argv[1]  # DLL path
+    seed = sys.argv[2]  # seed string
+ 
+    try:
+        key = generate_key(dll_path, seed)
+    except OSError as e:
+        print(f"Error: DLL load failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    computed_key = key.hex().upper()
+ 
+    # Print the key (so Python 64-bit can read it)
+    sys.stdout.write(f"{computed_key}\n")
+    sys.stdout.flush()
+ 
+if __name__ == "__main__":
+    main()